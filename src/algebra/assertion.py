@@ -1,11 +1,26 @@
+import concurrent.futures
 import itertools
+import math
+import multiprocessing
 
+import numpy as np
 
-def is_associative(f, elements):
+
+def _associative(f, a, b, c):
+    assert f(f(a, b), c) == f(a, f(b, c)), (
+        f"f(f({a}, {b}), {c}) == {f(f(a, b), c)} != {f(a, f(b, c))} == f({a}, f({b}, {c}))"
+    )
+
+
+def is_associative(f, elements, *, workers=None):
+    """Checks that f is associative on elements.
+
+    With workers > 1, the check runs in a process pool; see _parallel.
+    """
+    if workers is not None and workers > 1:
+        return _parallel(_associative, (f,), elements, workers)
     for a, b, c in itertools.product(elements, repeat=3):
-        assert f(f(a, b), c) == f(a, f(b, c)), (
-            f"f(f({a}, {b}), {c}) == {f(f(a, b), c)} != {f(a, f(b, c))} == f({a}, f({b}, {c}))"
-        )
+        _associative(f, a, b, c)
 
 
 def is_commutative(f, elements):
@@ -34,16 +49,499 @@ def has_inverses(e, f, inv, elements):
         assert f(inv(a), a) == e
 
 
-def left_distributes_over(f, g, elements):
+def _left_distributive(f, g, a, b, c):
+    assert f(a, g(b, c)) == g(f(a, b), f(a, c))
+
+
+def _right_distributive(f, g, a, b, c):
+    assert f(g(a, b), c) == g(f(a, c), f(b, c))
+
+
+def left_distributes_over(f, g, elements, *, workers=None):
+    if workers is not None and workers > 1:
+        return _parallel(_left_distributive, (f, g), elements, workers)
     for a, b, c in itertools.product(elements, repeat=3):
-        assert f(a, g(b, c)) == g(f(a, b), f(a, c))
+        _left_distributive(f, g, a, b, c)
 
 
-def right_distributes_over(f, g, elements):
+def right_distributes_over(f, g, elements, *, workers=None):
+    if workers is not None and workers > 1:
+        return _parallel(_right_distributive, (f, g), elements, workers)
     for a, b, c in itertools.product(elements, repeat=3):
-        assert f(g(a, b), c) == g(f(a, c), f(b, c))
+        _right_distributive(f, g, a, b, c)
+
+
+def distributes_over(f, g, elements, *, workers=None):
+    left_distributes_over(f, g, elements, workers=workers)
+    right_distributes_over(f, g, elements, workers=workers)
+
+
+# Parallel checks of properties of triples. The triples are sharded by their
+# first element across a process pool, so the operations and elements must be
+# picklable unless processes are forked. Each shard stops at its first
+# counterexample. A shared value holds the smallest shard with a
+# counterexample so far, and later shards stop early once it is set. The
+# counterexample that is reported is therefore the first in
+# itertools.product order, as in the sequential checks.
+
+_worker = None
+
+
+def _init_worker(check, ops, elements, best):
+    global _worker
+    _worker = check, ops, elements, best
+
+
+def _check_shard(i):
+    """Returns the first (i, j, k) for which the check fails, or None."""
+    check, ops, elements, best = _worker
+    a = elements[i]
+    for j, b in enumerate(elements):
+        if best.value < i:
+            return None
+        for k, c in enumerate(elements):
+            try:
+                check(*ops, a, b, c)
+            except AssertionError:
+                with best.get_lock():
+                    best.value = min(best.value, i)
+                return i, j, k
+    return None
+
+
+def _parallel(check, ops, elements, workers):
+    elements = list(elements)
+    context = multiprocessing.get_context()
+    best = context.Value("q", len(elements))
+    initargs = check, ops, elements, best
+    failures = []
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker, initargs=initargs
+    ) as pool:
+        futures = {pool.submit(_check_shard, i): i for i in range(len(elements))}
+        for future in concurrent.futures.as_completed(futures):
+            if future.cancelled():
+                continue
+            failure = future.result()
+            if failure is not None:
+                failures.append(failure)
+                for other, i in futures.items():
+                    if i > failure[0]:
+                        other.cancel()
+    if failures:
+        i, j, k = min(failures)
+        # Raises the same AssertionError as the sequential check.
+        check(*ops, elements[i], elements[j], elements[k])
+
+
+# Table-based variants of the checks above. A table is a square integer array
+# with table[i, j] the index of f(elements[i], elements[j]). Counterexamples
+# are reported for the first failing tuple in itertools.product order, using
+# the same messages as the checks above.
+
+_CHUNK = 1 << 22
+
+
+def tabulate(f, elements):
+    """Returns (elements, table) such that table[i, j] indexes f(elements[i], elements[j])."""
+    elements = list(elements)
+    index = {a: i for i, a in enumerate(elements)}
+    table = np.empty((len(elements), len(elements)), dtype=np.intp)
+    for i, a in enumerate(elements):
+        for j, b in enumerate(elements):
+            c = f(a, b)
+            assert c in index, f"f({a}, {b}) == {c} is not an element"
+            table[i, j] = index[c]
+    return elements, table
+
+
+def _namer(elements):
+    if elements is None:
+        return lambda i: int(i)
+    return lambda i: elements[i]
+
+
+def blocks(n):
+    """Yields (start, stop) ranges of rows that split an n×n×n check into blocks.
+
+    Each block has about _CHUNK entries.
+    """
+    step = max(1, _CHUNK // max(1, n * n))
+    for start in range(0, n, step):
+        yield start, min(n, start + step)
+
+
+def _first(mismatch):
+    return tuple(int(i) for i in np.argwhere(mismatch)[0])
+
+
+def table_is_associative(table, elements=None):
+    table = np.asarray(table)
+    name = _namer(elements)
+    for start, stop in blocks(len(table)):
+        rows = table[start:stop]
+        lhs = table[rows]
+        rhs = rows[:, table]
+        mismatch = lhs != rhs
+        if mismatch.any():
+            a, b, c = _first(mismatch)
+            a += start
+            ab_c, a_bc = table[table[a, b], c], table[a, table[b, c]]
+            a, b, c = name(a), name(b), name(c)
+            raise AssertionError(
+                f"f(f({a}, {b}), {c}) == {name(ab_c)} != {name(a_bc)} == f({a}, f({b}, {c}))"
+            )
+
+
+def table_is_commutative(table, elements=None):
+    table = np.asarray(table)
+    name = _namer(elements)
+    mismatch = table != table.T
+    if mismatch.any():
+        a, b = _first(mismatch)
+        ab, ba = name(table[a, b]), name(table[b, a])
+        a, b = name(a), name(b)
+        raise AssertionError(f"f({a}, {b}) == {ab} != {ba} = f({b}, {a})")
+
+
+def table_is_left_identity(e, table, elements=None):
+    table = np.asarray(table)
+    name = _namer(elements)
+    mismatch = table[e] != np.arange(len(table))
+    if mismatch.any():
+        (a,) = _first(mismatch)
+        raise AssertionError(f"f({name(e)}, {name(a)}) == {name(table[e, a])} != {name(a)}")
+
+
+def table_is_right_identity(e, table, elements=None):
+    table = np.asarray(table)
+    name = _namer(elements)
+    mismatch = table[:, e] != np.arange(len(table))
+    if mismatch.any():
+        (a,) = _first(mismatch)
+        raise AssertionError(f"f({name(a)}, {name(e)}) == {name(table[a, e])} != {name(a)}")
+
+
+def table_is_identity(e, table, elements=None):
+    table_is_left_identity(e, table, elements)
+    table_is_right_identity(e, table, elements)
+
+
+def table_has_inverses(e, inv, table, elements=None):
+    table = np.asarray(table)
+    inv = np.asarray(inv)
+    name = _namer(elements)
+    a = np.arange(len(table))
+    mismatch = table[a, inv] != e
+    if mismatch.any():
+        (i,) = _first(mismatch)
+        j = inv[i]
+        raise AssertionError(f"f({name(i)}, {name(j)}) == {name(table[i, j])} != {name(e)}")
+    mismatch = table[inv, a] != e
+    if mismatch.any():
+        (i,) = _first(mismatch)
+        j = inv[i]
+        raise AssertionError(f"f({name(j)}, {name(i)}) == {name(table[j, i])} != {name(e)}")
+
+
+def table_left_distributes_over(f, g, elements=None):
+    f = np.asarray(f)
+    g = np.asarray(g)
+    name = _namer(elements)
+    for start, stop in blocks(len(f)):
+        rows = f[start:stop]
+        lhs = rows[:, g]
+        rhs = g[rows[:, :, None], rows[:, None, :]]
+        mismatch = lhs != rhs
+        if mismatch.any():
+            a, b, c = _first(mismatch)
+            a += start
+            x, y = f[a, g[b, c]], g[f[a, b], f[a, c]]
+            a, b, c = name(a), name(b), name(c)
+            raise AssertionError(
+                f"f({a}, g({b}, {c})) == {name(x)} != {name(y)} == g(f({a}, {b}), f({a}, {c}))"
+            )
+
+
+def table_right_distributes_over(f, g, elements=None):
+    f = np.asarray(f)
+    g = np.asarray(g)
+    name = _namer(elements)
+    for start, stop in blocks(len(f)):
+        rows = g[start:stop]
+        lhs = f[rows]
+        rhs = g[f[start:stop, None, :], f[None, :, :]]
+        mismatch = lhs != rhs
+        if mismatch.any():
+            a, b, c = _first(mismatch)
+            a += start
+            x, y = f[g[a, b], c], g[f[a, c], f[b, c]]
+            a, b, c = name(a), name(b), name(c)
+            raise AssertionError(
+                f"f(g({a}, {b}), {c}) == {name(x)} != {name(y)} == g(f({a}, {c}), f({b}, {c}))"
+            )
 
 
-def distributes_over(f, g, elements):
-    left_distributes_over(f, g, elements)
-    right_distributes_over(f, g, elements)
+def table_distributes_over(f, g, elements=None):
+    table_left_distributes_over(f, g, elements)
+    table_right_distributes_over(f, g, elements)
+
+
+# Randomized checks in the style of
+#
+# Sridhar Rajagopalan and Leonard J. Schulman (2000). "Verification of
+# identities." SIAM Journal on Computing, 29 (4): 1155–1163.
+#
+# Each side of an identity in which every variable occurs exactly once is
+# evaluated on random vectors of the magma algebra over GF(p). If the
+# identity fails for some tuple of elements, the two sides differ as
+# multilinear polynomials and a round detects this with probability at least
+# 1 - degree/p. A detected failure is narrowed down to a concrete
+# counterexample by splitting the supports of the random vectors in half.
+
+_P = 8191
+
+
+def _mul(table, x, y):
+    """Returns the product of x and y in the magma algebra of table over GF(p)."""
+    n = len(table)
+    z = np.zeros(n, dtype=np.int64)
+    (support,) = np.nonzero(x)
+    step = max(1, _CHUNK // n)
+    for start in range(0, len(support), step):
+        rows = support[start : start + step]
+        w = x[rows, None] * y[None, :] % _P
+        z += np.bincount(table[rows].ravel(), weights=w.ravel(), minlength=n).astype(np.int64)
+    return z % _P
+
+
+def _map(u, x):
+    """Returns the linear extension of the map u applied to x."""
+    return np.bincount(u, weights=x, minlength=len(u)).astype(np.int64) % _P
+
+
+def _rounds(confidence, degree):
+    return max(1, math.ceil(math.log1p(-confidence) / math.log(degree / _P)))
+
+
+def _narrow(differs, vectors):
+    """Returns indices (a, b, ...) such that differs(e_a, e_b, ...) holds."""
+    vectors = list(vectors)
+    result = []
+    for k, x in enumerate(vectors):
+        (support,) = np.nonzero(x)
+        while len(support) > 1:
+            half = support[: len(support) // 2]
+            y = np.zeros_like(x)
+            y[half] = x[half]
+            vectors[k] = y
+            if differs(*vectors):
+                x, support = y, half
+            else:
+                x, support = x - y, support[len(half) :]
+            vectors[k] = x
+        result.append(int(support[0]))
+    return tuple(result)
+
+
+def _randomized(lhs, rhs, n, arity, degree, confidence, seed):
+    """Returns (rounds, None) if no counterexample was found, else (round, counterexample)."""
+
+    def differs(*vectors):
+        return not np.array_equal(lhs(*vectors), rhs(*vectors))
+
+    rng = np.random.default_rng(seed)
+    rounds = _rounds(confidence, degree)
+    for k in range(rounds):
+        vectors = [rng.integers(0, _P, n, dtype=np.int64) for _ in range(arity)]
+        if differs(*vectors):
+            return k, _narrow(differs, vectors)
+    return rounds, None
+
+
+def table_is_probably_associative(table, elements=None, *, confidence=1 - 1e-12, seed=None):
+    """Checks associativity with error probability at most 1 - confidence.
+
+    Returns the number of rounds passed.
+    """
+    table = np.asarray(table)
+    name = _namer(elements)
+
+    def lhs(x, y, z):
+        return _mul(table, _mul(table, x, y), z)
+
+    def rhs(x, y, z):
+        return _mul(table, x, _mul(table, y, z))
+
+    rounds, counterexample = _randomized(lhs, rhs, len(table), 3, 3, confidence, seed)
+    if counterexample is not None:
+        a, b, c = counterexample
+        ab_c, a_bc = table[table[a, b], c], table[a, table[b, c]]
+        a, b, c = name(a), name(b), name(c)
+        raise AssertionError(
+            f"f(f({a}, {b}), {c}) == {name(ab_c)} != {name(a_bc)} == f({a}, f({b}, {c}))"
+        )
+    return rounds
+
+
+def is_probably_associative(f, elements, *, confidence=1 - 1e-12, seed=None):
+    elements, table = tabulate(f, elements)
+    return table_is_probably_associative(table, elements, confidence=confidence, seed=seed)
+
+
+def table_is_probably_ward(div, elements=None, *, confidence=1 - 1e-12, seed=None):
+    """Checks Ward's postulates for the division table div.
+
+    Postulates 1, 2 and 4 are checked exhaustively, Postulate 3 with error
+    probability at most 1 - confidence. Returns the number of rounds passed.
+    """
+    div = np.asarray(div)
+    name = _namer(elements)
+    n = len(div)
+    assert div.shape == (n, n) and n > 0
+    mismatch = (div < 0) | (div >= n)
+    if mismatch.any():
+        a, b = _first(mismatch)
+        raise AssertionError(f"{name(a)} / {name(b)} == {div[a, b]} is not an element")
+    diagonal = np.diagonal(div)
+    mismatch = diagonal != diagonal[0]
+    if mismatch.any():
+        (a,) = _first(mismatch)
+        x, y = name(diagonal[a]), name(diagonal[0])
+        raise AssertionError(f"{name(a)} / {name(a)} == {x} != {y} == {name(0)} / {name(0)}")
+    i = diagonal[0]
+    inv = div[i]
+    seen = np.full(n, -1)
+    for b, c in enumerate(inv.tolist()):
+        if seen[c] >= 0:
+            a = seen[c]
+            raise AssertionError(
+                f"{name(i)} / {name(a)} == {name(c)} == {name(i)} / {name(b)}"
+                f" but {name(a)} != {name(b)}"
+            )
+        seen[c] = b
+
+    def lhs(x, y, z):
+        return _mul(div, _mul(div, x, y), z)
+
+    def rhs(x, y, z):
+        return _mul(div, x, _mul(div, z, _map(inv, y)))
+
+    rounds, counterexample = _randomized(lhs, rhs, n, 3, 3, confidence, seed)
+    if counterexample is not None:
+        a, b, c = counterexample
+        x, y = div[div[a, b], c], div[a, div[c, inv[b]]]
+        a, b, c, i = name(a), name(b), name(c), name(i)
+        raise AssertionError(
+            f"({a} / {b}) / {c} == {name(x)} != {name(y)} == {a} / ({c} / ({i} / {b}))"
+        )
+    return rounds
+
+
+def is_probably_ward(div, elements, *, confidence=1 - 1e-12, seed=None):
+    elements, table = tabulate(div, elements)
+    return table_is_probably_ward(table, elements, confidence=confidence, seed=seed)
+
+
+# Light's associativity test: if (x g) y == x (g y) for all x, y and every g
+# in a set that generates the magma, then the magma is associative. This
+# needs O(n² |generators|) instead of O(n³) evaluations of f, but is only
+# valid when the elements are closed under f.
+
+
+def _generating_set(f, elements, generators):
+    """Returns generators extended to generate elements, or None if elements are not closed."""
+    elements = list(elements)
+    members = set(elements)
+    inside = set()
+    closure = []
+    gens = []
+    for a in itertools.chain(generators, elements):
+        if a in inside:
+            continue
+        gens.append(a)
+        inside.add(a)
+        queue = [a]
+        while queue:
+            x = queue.pop()
+            closure.append(x)
+            for y in closure:
+                for z in (f(x, y), f(y, x)):
+                    if z not in members:
+                        return None
+                    if z not in inside:
+                        inside.add(z)
+                        queue.append(z)
+    return gens
+
+
+def generating_set(f, elements, generators=()):
+    """Returns a small list of elements that generates the magma (elements, f).
+
+    The result starts with the given generators, extended greedily by
+    elements that are not yet in the closure.
+    """
+    gens = _generating_set(f, elements, generators)
+    assert gens is not None, "elements are not closed under f"
+    return gens
+
+
+def is_associative_light(f, elements, generators=None):
+    """Checks associativity with Light's test, falling back to is_associative."""
+    elements = list(elements)
+    gens = _generating_set(f, elements, generators or ())
+    if gens is None or len(gens) >= len(elements):
+        return is_associative(f, elements)
+    for a, b, c in itertools.product(elements, gens, elements):
+        assert f(f(a, b), c) == f(a, f(b, c)), (
+            f"f(f({a}, {b}), {c}) == {f(f(a, b), c)} != {f(a, f(b, c))} == f({a}, f({b}, {c}))"
+        )
+
+
+def table_generating_set(table, generators=()):
+    """Returns a small list of indices that generates the magma of table."""
+    table = np.asarray(table)
+    n = len(table)
+    inside = np.zeros(n, dtype=bool)
+    gens = []
+    for a in itertools.chain(generators, range(n)):
+        if inside[a]:
+            continue
+        gens.append(int(a))
+        frontier = np.array([a])
+        inside[a] = True
+        while len(frontier):
+            (closure,) = np.nonzero(inside)
+            z = np.concatenate(
+                [
+                    table[np.ix_(frontier, closure)].ravel(),
+                    table[np.ix_(closure, frontier)].ravel(),
+                ]
+            )
+            z = np.unique(z[~inside[z]])
+            inside[z] = True
+            frontier = z
+    return gens
+
+
+def table_is_associative_light(table, elements=None, generators=None):
+    """Checks associativity with Light's test, falling back to table_is_associative."""
+    table = np.asarray(table)
+    gens = table_generating_set(table, generators or ())
+    if len(gens) >= len(table):
+        return table_is_associative(table, elements)
+    name = _namer(elements)
+    counterexamples = []
+    for k, b in enumerate(gens):
+        mismatch = table[table[:, b]] != table[:, table[b]]
+        if mismatch.any():
+            a, c = _first(mismatch)
+            counterexamples.append((a, k, c))
+    if counterexamples:
+        a, k, c = min(counterexamples)
+        b = gens[k]
+        ab_c, a_bc = table[table[a, b], c], table[a, table[b, c]]
+        a, b, c = name(a), name(b), name(c)
+        raise AssertionError(
+            f"f(f({a}, {b}), {c}) == {name(ab_c)} != {name(a_bc)} == f({a}, f({b}, {c}))"
+        )
@@ -0,0 +1,269 @@
+"""Benchmarks for the hot paths of the library.
+
+Run as
+
+    python -m algebra.benchmark --output results.json
+    python -m algebra.benchmark --baseline results.json --threshold 0.25
+
+to measure the time and peak memory per call of each benchmark, save the
+results as JSON, and compare them against a stored baseline. The exit status
+is 1 if any benchmark became slower or used more memory than the baseline by
+more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .dihedral_group import DihedralGroup
+from .free_group import FreeGroup, FreeGroupElement
+from .modular import crt
+from .modular_group import Units
+from .power import group_integer_power, window_integer_power
+from .ward_quasigroup import WardQuasigroup
+
+
+def _word(length, offset=0):
+    """Returns a reduced word in a, b with the given number of syllables."""
+    return FreeGroupElement([("ab"[(i + offset) % 2], 1 + i % 3) for i in range(length)])
+
+
+def bench_dihedral_op(n):
+    """DihedralGroup.op in D(n)."""
+    G = DihedralGroup(n)
+    pairs = [((True, 1), (False, n // 2)), ((False, n - 1), (True, n // 3))]
+
+    def run():
+        for a, b in pairs:
+            G.op(a, b)
+
+    return run
+
+
+def bench_free_group_mul(length):
+    """FreeGroupElement.__mul__ of words with length syllables, with and without cancelling."""
+    a = _word(length)
+    b = _word(length, 1)
+    c = FreeGroupElement(a.inv().value[: length // 2])
+
+    def run():
+        a * b
+        a * c
+
+    return run
+
+
+def bench_free_group_pow(length):
+    """FreeGroupElement.__pow__ of a conjugate of a word with length syllables."""
+    G = FreeGroup(["a", "b"])
+    a, b = G.generators()
+    w = a * _word(length, 1) * a.inv()
+
+    def run():
+        w**3
+        w**-2
+
+    return run
+
+
+def bench_group_integer_power(bits):
+    """group_integer_power in (Z/(2¹²⁷ - 1)Z)ˣ with exponents of the given bit length.
+
+    The group has no element_order, so exponents are not reduced.
+    """
+    G = Units(2**127 - 1, table=False)
+    exponent = (1 << bits) - 3
+
+    def run():
+        group_integer_power(G, 3, exponent)
+
+    return run
+
+
+def bench_window_integer_power(bits):
+    """window_integer_power in D(1009) with exponents of the given bit length."""
+    G = DihedralGroup(1009)
+    a = (True, 17)
+    exponent = (1 << bits) - 3
+
+    def run():
+        window_integer_power(G, a, exponent)
+
+    return run
+
+
+def bench_crt(bits):
+    """crt of two congruences with moduli of the given bit length."""
+    m = (1 << bits) - 1
+    n = (1 << bits) + 1
+    a = m // 3
+    b = n // 5
+
+    def run():
+        crt(a, m, b, n)
+
+    return run
+
+
+def bench_ward_quasigroup(n, precompute=False):
+    """WardQuasigroupElement * and ^ in the quasigroup of Z/n with a / b = a - b."""
+    W = WardQuasigroup(list(range(n)), lambda a, b: (a - b) % n)
+    if precompute:
+        W.precompute()
+    elements = list(W)
+    pairs = list(zip(elements, reversed(elements)))
+
+    def run():
+        for a, b in pairs:
+            a * b
+            a ^ b
+
+    return run
+
+
+def bench_ward_quasigroup_precomputed(n):
+    """As ward_quasigroup, after WardQuasigroup.precompute."""
+    return bench_ward_quasigroup(n, precompute=True)
+
+
+BENCHMARKS = {
+    "dihedral_op": bench_dihedral_op,
+    "free_group_mul": bench_free_group_mul,
+    "free_group_pow": bench_free_group_pow,
+    "group_integer_power": bench_group_integer_power,
+    "window_integer_power": bench_window_integer_power,
+    "crt": bench_crt,
+    "ward_quasigroup": bench_ward_quasigroup,
+    "ward_quasigroup_precomputed": bench_ward_quasigroup_precomputed,
+}
+
+# Parameters for each benchmark, from smoke runs to full runs.
+SIZES = {
+    "quick": {
+        "dihedral_op": [10, 1000],
+        "free_group_mul": [10, 1000],
+        "free_group_pow": [10, 100],
+        "group_integer_power": [10, 100],
+        "window_integer_power": [10, 100],
+        "crt": [16, 64],
+        "ward_quasigroup": [5, 50],
+        "ward_quasigroup_precomputed": [5, 50],
+    },
+    "full": {
+        "dihedral_op": [10, 1000, 10**6, 10**18],
+        "free_group_mul": [10, 1000, 10**5, 10**6],
+        "free_group_pow": [10, 1000, 10**5],
+        "group_integer_power": [10, 100, 1000],
+        "window_integer_power": [10, 100, 1000],
+        "crt": [16, 64, 256, 1024, 4096],
+        "ward_quasigroup": [5, 50, 500],
+        "ward_quasigroup_precomputed": [5, 50, 500],
+    },
+}
+
+
+def measure(run, min_time=0.2, repeat=3):
+    """Returns (seconds, peak_bytes) for a single call of run.
+
+    The time is the best of repeat measurements, each averaging over enough
+    calls to take at least min_time seconds.
+    """
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, peak
+
+
+def run_benchmarks(sizes="quick", names=None, min_time=0.2):
+    """Returns a dict of results, keyed by benchmark name and parameter."""
+    results = {}
+    for name, params in SIZES[sizes].items():
+        if names and name not in names:
+            continue
+        for param in params:
+            seconds, peak = measure(BENCHMARKS[name](param), min_time=min_time)
+            results[f"{name}[{param}]"] = {"seconds": seconds, "peak_bytes": peak}
+    return results
+
+
+def save(results, path):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def compare(results, baseline, threshold=0.25):
+    """Returns a list of (key, metric, old, new) that regressed by more than threshold."""
+    regressions = []
+    for key, new in sorted(results.items()):
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if new[metric] > old[metric] * (1 + threshold):
+                regressions.append((key, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", choices=sorted(SIZES), default="quick")
+    parser.add_argument(
+        "--only", nargs="*", choices=sorted(BENCHMARKS), help="benchmarks to run"
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results in this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed relative slowdown"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only, args.min_time)
+    baseline = load(args.baseline) if args.baseline else {}
+    for key, result in results.items():
+        line = f"{key:32} {result['seconds'] * 1e6:14.3f} µs {result['peak_bytes']:12d} B"
+        if key in baseline:
+            ratio = result["seconds"] / baseline[key]["seconds"]
+            line += f" {ratio:8.2f}x"
+        print(line)
+    if args.output:
+        save(results, args.output)
+    regressions = compare(results, baseline, args.threshold)
+    for key, metric, old, new in regressions:
+        print(f"REGRESSION {key} {metric}: {old:g} -> {new:g}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""Finite groups compiled into integer-indexed Cayley tables."""
+
+import numpy as np
+
+from . import assertion
+from .overload import GroupWrapper
+
+
+class CayleyTable:
+    """A finite group whose elements are the indices 0, ..., n-1.
+
+    The group G must provide __iter__, op, inv and identity. Its elements are
+    numbered in iteration order and the group operation becomes a lookup in
+    an n×n table of indices.
+    """
+
+    # Indices are also the codes of batch operations. Their encode and
+    # decode convert to and from elements of G instead.
+    CODES_ARE_VALUES = True
+
+    def __init__(self, G):
+        self.G = G
+        self._elements = list(G)
+        self._index = {a: i for i, a in enumerate(self._elements)}
+        assert len(self._index) == len(self._elements)
+        n = len(self._elements)
+        assert n > 0
+        index = self._index
+        if hasattr(G, "op_many") and hasattr(G, "encode") and not isinstance(G, GroupWrapper):
+            codes = np.array([G.encode(a) for a in self._elements], dtype=np.intp)
+            # Codes need not be 0, ..., n-1, as long as they are small.
+            position = np.full(codes.max() + 1, -1, dtype=np.intp)
+            position[codes] = np.arange(n)
+            table = position[G.op_many(codes[:, None], codes[None, :])]
+        else:
+            table = np.empty((n, n), dtype=np.intp)
+            for i, a in enumerate(self._elements):
+                table[i] = [index[G.op(a, b)] for b in self._elements]
+        self.table = table
+        self.inverses = np.array([index[G.inv(a)] for a in self._elements], dtype=np.intp)
+        self._identity = index[G.identity()]
+        # Plain Python lists make scalar lookups much cheaper than indexing
+        # into NumPy arrays.
+        self._rows = table.tolist()
+        self._inv = self.inverses.tolist()
+        self._powers = {}
+        # Subgroups computed so far, keyed by the bitset of their generators.
+        self._subgroups = {}
+        self._classes = None
+        self._centralizers = {}
+        self._center = None
+
+    def __repr__(self):
+        return f"CayleyTable({self.G!r})"
+
+    def __str__(self):
+        return f"CayleyTable({self.G})"
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __iter__(self):
+        return iter(range(len(self._elements)))
+
+    def order(self):
+        return len(self._elements)
+
+    def encode(self, x):
+        """Returns the index of the element x of the underlying group."""
+        return self._index[x]
+
+    def decode(self, a):
+        """Returns the element of the underlying group with index a."""
+        return self._elements[a]
+
+    def pretty(self, a):
+        x = self._elements[a]
+        if hasattr(self.G, "pretty"):
+            return self.G.pretty(x)
+        return repr(x)
+
+    def generators(self):
+        # Wrappers always have generators, which fail if the group does not.
+        G = self.G.G if isinstance(self.G, GroupWrapper) else self.G
+        if hasattr(G, "generators"):
+            for x in self.G.generators():
+                yield self._index[x]
+        else:
+            yield from assertion.table_generating_set(self.table)
+
+    def identity(self):
+        return self._identity
+
+    def inv(self, a):
+        return self._inv[a]
+
+    def op(self, a, b):
+        return self._rows[a][b]
+
+    def powers(self, a):
+        """Returns the list of powers a⁰, a¹, ... up to the order of a, computed once."""
+        powers = self._powers.get(a)
+        if powers is None:
+            row = self._rows[a]
+            powers = [self._identity]
+            b = a
+            while b != self._identity:
+                powers.append(b)
+                b = row[b]
+            self._powers[a] = powers
+        return powers
+
+    def element_order(self, a):
+        return len(self.powers(a))
+
+    def rep(self, a, exponent):
+        n = int(exponent)
+        if n != exponent:
+            raise ValueError(f"cannot handle exponent {exponent}")
+        powers = self.powers(a)
+        return powers[n % len(powers)]
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of indices."""
+        return self.table[a, b]
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of indices."""
+        return self.inverses[a]
+
+    def rep_many(self, a, exponent):
+        """Vectorized integer powers of an array of indices."""
+        # Since a**order is the identity, exponents may be reduced first, which
+        # also makes them non-negative.
+        exponent = np.asarray(np.asarray(exponent) % len(self._elements), dtype=np.intp)
+        base, exponent = np.broadcast_arrays(np.asarray(a), exponent)
+        result = np.full(base.shape, self._identity, dtype=np.intp)
+        while np.any(exponent > 0):
+            odd = (exponent & 1).astype(bool)
+            result = np.where(odd, self.table[result, base], result)
+            base = self.table[base, base]
+            exponent = exponent >> 1
+        return result
+
+    # Subsets of the group are represented as bitsets: Python ints whose bit
+    # a is set iff the element with index a is in the subset. Internally,
+    # closures work on boolean masks over the indices.
+
+    def bitset(self, indices):
+        """Returns the bitset of an iterable of indices."""
+        bits = 0
+        for a in indices:
+            bits |= 1 << int(a)
+        return bits
+
+    def members(self, bits):
+        """Returns the sorted array of indices in a bitset."""
+        return np.flatnonzero(self._mask(bits))
+
+    def _mask(self, bits):
+        n = len(self._elements)
+        data = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(data, count=n, bitorder="little").astype(bool)
+
+    def _bits(self, mask):
+        return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+    def _closure(self, start, generators, action):
+        """Returns the mask of the closure of start under x ↦ action(x, g) for each g."""
+        seen = np.zeros(len(self._elements), dtype=bool)
+        frontier = np.unique(np.asarray(start, dtype=np.intp))
+        seen[frontier] = True
+        generators = np.asarray(generators, dtype=np.intp)
+        while frontier.size and generators.size:
+            image = np.unique(action(frontier[:, None], generators[None, :]))
+            frontier = image[~seen[image]]
+            seen[frontier] = True
+        return seen
+
+    def _right_multiply(self, x, g):
+        return self.table[x, g]
+
+    def subgroup(self, generators):
+        """Returns the bitset of the subgroup generated by the given indices.
+
+        Results are cached. The closure starts from the largest cached
+        subgroup whose generators are among the given ones.
+        """
+        generators = sorted(set(int(g) for g in generators))
+        key = self.bitset(generators)
+        bits = self._subgroups.get(key)
+        if bits is not None:
+            return bits
+        start = 1 << self._identity
+        for k, H in self._subgroups.items():
+            if k & ~key == 0 and bin(H).count("1") > bin(start).count("1"):
+                start = H
+        if key & ~start == 0:
+            bits = start
+        else:
+            mask = self._closure(self.members(start), generators, self._right_multiply)
+            bits = self._bits(mask)
+        self._subgroups[key] = bits
+        return bits
+
+    def subgroups(self):
+        """Returns the set of bitsets of all subgroups computed so far."""
+        return set(self._subgroups.values())
+
+    def cosets(self, H, side="left"):
+        """Returns the list of bitsets of the left (aH) or right (Ha) cosets of H.
+
+        The cosets are ordered by their smallest index.
+        """
+        assert side in ("left", "right")
+        members = self.members(H)
+        remaining = np.ones(len(self._elements), dtype=bool)
+        cosets = []
+        while True:
+            unassigned = np.flatnonzero(remaining)
+            if not unassigned.size:
+                return cosets
+            a = unassigned[0]
+            coset = self.table[a, members] if side == "left" else self.table[members, a]
+            remaining[coset] = False
+            mask = np.zeros(len(self._elements), dtype=bool)
+            mask[coset] = True
+            cosets.append(self._bits(mask))
+
+    def normal_closure(self, generators):
+        """Returns the bitset of the smallest normal subgroup containing the given indices."""
+        generators = list(dict.fromkeys(int(g) for g in generators))
+        group_generators = list(self.generators())
+        N = self.subgroup(generators)
+        pending = list(generators)
+        while pending:
+            x = pending.pop()
+            for g in group_generators:
+                y = self._rows[self._rows[self._inv[g]][x]][g]
+                if not N >> y & 1:
+                    generators.append(y)
+                    pending.append(y)
+                    N = self.subgroup(generators)
+        return N
+
+    def _conjugate(self, x, g):
+        return self.table[self.table[self.inverses[g], x], g]
+
+    def orbit(self, a, generators=None, action=None):
+        """Returns the bitset of the orbit of a under the group generated by generators.
+
+        The action defaults to conjugation, x ↦ g⁻¹ x g. Otherwise it must be
+        a function action(x, g) that is vectorized over arrays of indices.
+        Generators default to those of the whole group.
+        """
+        if generators is None:
+            generators = list(self.generators())
+        if action is None:
+            action = self._conjugate
+        return self._bits(self._closure([a], generators, action))
+
+    def _closed_form(self, attr):
+        """Returns the closed-form method attr of the underlying group, if any."""
+        if isinstance(self.G, GroupWrapper):
+            return None
+        return getattr(self.G, attr, None)
+
+    def conjugacy_classes(self):
+        """Returns the list of bitsets of the conjugacy classes, ordered by smallest index."""
+        if self._classes is None:
+            closed_form = self._closed_form("conjugacy_classes")
+            if closed_form is not None:
+                classes = [self.bitset(self._index[x] for x in C) for C in closed_form()]
+                classes.sort(key=lambda C: C & -C)
+            else:
+                classes = []
+                remaining = (1 << len(self._elements)) - 1
+                while remaining:
+                    a = (remaining & -remaining).bit_length() - 1
+                    C = self.orbit(a)
+                    classes.append(C)
+                    remaining &= ~C
+            self._classes = classes
+        return self._classes
+
+    def centralizer(self, a):
+        """Returns the bitset of the elements that commute with the index a."""
+        bits = self._centralizers.get(a)
+        if bits is None:
+            closed_form = self._closed_form("centralizer")
+            if closed_form is not None:
+                bits = self.bitset(self._index[x] for x in closed_form(self._elements[a]))
+            else:
+                bits = self._bits(self.table[a] == self.table[:, a])
+            self._centralizers[a] = bits
+        return bits
+
+    def center(self):
+        """Returns the bitset of the center, which is the intersection of the centralizers.
+
+        Only the centralizers of the generators are intersected.
+        """
+        if self._center is None:
+            closed_form = self._closed_form("center")
+            if closed_form is not None:
+                self._center = self.bitset(self._index[x] for x in closed_form())
+            else:
+                mask = np.ones(len(self._elements), dtype=bool)
+                for g in self.generators():
+                    mask &= self.table[g] == self.table[:, g]
+                self._center = self._bits(mask)
+        return self._center
+
+    def class_equation(self):
+        """Returns (|Z(G)|, sizes) such that |G| = |Z(G)| + sum(sizes).
+
+        The sizes are those of the non-central conjugacy classes, in
+        increasing order.
+        """
+        sizes = sorted(bin(C).count("1") for C in self.conjugacy_classes())
+        central = sizes.count(1)
+        return central, sizes[central:]
@@ -1,7 +1,10 @@
+import math
+
+import numpy as np
+
 from .format import subscript
 from .modular import crt
 from .overload import Multiplicative
-from .power import group_integer_power
 
 
 def D(degree=None, *, order=None):
@@ -29,6 +32,12 @@ class DihedralGroup:
     def order(self):
         return 2 * self._n
 
+    def element_order(self, a):
+        rot, i = a
+        if rot:
+            return self._n // math.gcd(i, self._n)
+        return 2
+
     def pretty(self, a):
         rot, i = a
         return f"{'r' if rot else 's'}{subscript(i)}"
@@ -39,6 +48,11 @@ class DihedralGroup:
         for i in range(self._n):
             yield False, i
 
+    def generators(self):
+        if self._n > 1:
+            yield True, 1
+        yield False, 0
+
     def identity(self):
         return True, 0
 
@@ -55,16 +69,100 @@ class DihedralGroup:
             j = -j
         return rot1 == rot2, (i + j) % self._n
 
+    def encode(self, a):
+        """Returns the index of a in iteration order: rᵢ ↦ i and sᵢ ↦ n + i."""
+        rot, i = a
+        return i if rot else self._n + i
+
+    def decode(self, code):
+        code = int(code)
+        if code < self._n:
+            return True, code
+        return False, code - self._n
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of encoded elements."""
+        n = self._n
+        a = np.asarray(a)
+        b = np.asarray(b)
+        rot1 = a < n
+        rot2 = b < n
+        j = np.where(rot1, b, -b)
+        k = (a + j) % n
+        return np.where(rot1 == rot2, k, k + n)
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of encoded elements."""
+        n = self._n
+        a = np.asarray(a)
+        return np.where(a < n, -a % n, a)
+
+    def rep_many(self, a, exponent):
+        """Vectorized integer powers of an array of encoded elements."""
+        n = self._n
+        a = np.asarray(a)
+        # Reduce first, so that exponents may be arbitrary Python integers.
+        exponent = np.asarray(exponent)
+        rotation = a * np.asarray(exponent % n, dtype=np.intp) % n
+        reflection = np.where(np.asarray(exponent % 2, dtype=bool), a, 0)
+        return np.where(a < n, rotation, reflection)
+
     def rep(self, a, exponent):
         n = int(exponent)
         if n == exponent:
-            return group_integer_power(self, a, n)
+            rot, i = a
+            if rot:
+                return True, i * n % self._n
+            return a if n % 2 else self.identity()
         r = 1 / exponent
         n = round(r)
         if 0 < n < 2**52 and abs((n - r) / n) < 2e-16:
             return self._root(a, n)
         raise ValueError(f"cannot handle exponent {exponent}")
 
+    def conjugacy_classes(self):
+        """Returns the list of conjugacy classes, in closed form."""
+        n = self._n
+        classes = []
+        for i in range(n // 2 + 1):
+            if 2 * i % n == 0:
+                classes.append([(True, i)])
+            else:
+                classes.append([(True, i), (True, n - i)])
+        if n % 2:
+            classes.append([(False, i) for i in range(n)])
+        else:
+            classes.append([(False, i) for i in range(0, n, 2)])
+            classes.append([(False, i) for i in range(1, n, 2)])
+        return classes
+
+    def centralizer(self, a):
+        """Returns the list of elements that commute with a, in closed form."""
+        n = self._n
+        rot, i = a
+        if n <= 2 or (rot and 2 * i % n == 0):
+            return list(self)
+        if rot:
+            return [(True, j) for j in range(n)]
+        if n % 2:
+            return [(True, 0), a]
+        return [(True, 0), (True, n // 2), a, (False, (i + n // 2) % n)]
+
+    def center(self):
+        """Returns the list of central elements, in closed form."""
+        n = self._n
+        if n <= 2:
+            return list(self)
+        if n % 2:
+            return [(True, 0)]
+        return [(True, 0), (True, n // 2)]
+
+    def class_equation(self):
+        """Returns (|Z(G)|, sizes) such that |G| = |Z(G)| + sum(sizes)."""
+        sizes = sorted(len(C) for C in self.conjugacy_classes())
+        central = sizes.count(1)
+        return central, sizes[central:]
+
     def _root(self, a, n):
         k = int(n)
         assert k == n
@@ -1,12 +1,15 @@
+import itertools
+import weakref
+
 from .format import superscript
-from .power import times_integer_power
 
 
 class FreeGroup:
 
-    def __init__(self, generators):
+    def __init__(self, generators, *, intern=False):
         self._generators = tuple(generators)
         assert self._generators
+        self._interned = weakref.WeakValueDictionary() if intern else None
 
     def __repr__(self):
         d = ", ".join(str(g) for g in self._generators)
@@ -18,34 +21,66 @@ class FreeGroup:
     def rank(self):
         return len(self._generators)
 
+    def intern(self, a):
+        """Returns the canonical object equal to the word a, if interning is enabled."""
+        if self._interned is None:
+            return a
+        return self._interned.setdefault(tuple(a.value), a)
+
     def generators(self):
         for g in self._generators:
-            yield FreeGroupElement([(g, 1)])
+            yield self.intern(FreeGroupElement([(g, 1)]))
 
     def identity(self):
-        return FreeGroupElement([])
+        return self.intern(FreeGroupElement([]))
 
     def one(self):
         return self.identity()
 
     def inv(self, a):
         assert isinstance(a, FreeGroupElement)
-        return a.inv()
+        return self.intern(a.inv())
 
     def op(self, a, b):
         assert isinstance(a, FreeGroupElement)
         assert isinstance(b, FreeGroupElement)
-        return a * b
+        return self.intern(a * b)
 
     def rep(self, a, n):
         assert isinstance(a, FreeGroupElement)
-        return a**n
+        return self.intern(a**n)
+
+    def subgroup(self, words):
+        """Returns the subgroup generated by words, as a FreeSubgroup."""
+        from .stallings import FreeSubgroup
+
+        return FreeSubgroup(self, words)
+
+
+# Words are hashed with a polynomial hash of their syllables modulo a Mersenne
+# prime. Each word caches the hashes of itself and of its inverse, which are
+# propagated through products and inverses without rehashing whole words.
+
+_P = (1 << 61) - 1
+_B = 0x5BD1E9955BD1E995 % _P
+_B_INV = pow(_B, -1, _P)
+
+
+def _poly_hash(syllables):
+    h = 0
+    x = 1
+    for s in syllables:
+        h = (h + hash(s) * x) % _P
+        x = x * _B % _P
+    return h
 
 
 class FreeGroupElement:
 
     def __init__(self, value):
         self.value = value
+        self._hash = None
+        self._inv_hash = None
 
     def __repr__(self):
         if not self.value:
@@ -53,16 +88,27 @@ class FreeGroupElement:
         return " ".join(f"{g}" if e == 1 else f"{g}{superscript(e)}" for g, e in self.value)
 
     def __eq__(self, other):
-        return self is other or self.value == other.value
+        if isinstance(other, FreeGroupPower):
+            return other == self
+        if self is other:
+            return True
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
+        return self.value == other.value
 
     def __ne__(self, other):
         return not (self == other)
 
     def __hash__(self):
-        return hash(tuple(self.value))
+        if self._hash is None:
+            self._hash = _poly_hash(self.value)
+            self._inv_hash = _poly_hash(_inverse(self.value))
+        return self._hash
 
     def inv(self):
-        return FreeGroupElement([(g, -e) for g, e in reversed(self.value)])
+        result = FreeGroupElement(_inverse(self.value))
+        result._hash, result._inv_hash = self._inv_hash, self._hash
+        return result
 
     def __mul__(self, other):
         a = self.value
@@ -73,24 +119,160 @@ class FreeGroupElement:
             return self
         i = len(a)
         j = 0
+        middle = []
         while i > 0 and j < len(b):
             x, m = a[i - 1]
             y, n = b[j]
             if x != y:
                 break
             k = m + n
-            if k != 0:
-                return FreeGroupElement(a[: i - 1] + [(x, k)] + b[j + 1 :])
             i -= 1
             j += 1
-        return FreeGroupElement(a[:i] + b[j:])
+            if k != 0:
+                middle = [(x, k)]
+                break
+        result = FreeGroupElement(a[:i] + middle + b[j:])
+        if self._hash is not None and other._hash is not None:
+            result._hash, result._inv_hash = _product_hashes(self, other, i, middle, j)
+        return result
+
+    def __pow__(self, exponent, mod=None):
+        n = int(exponent)
+        if n == exponent:
+            return self.lazy_pow(n).expand()
+        raise ValueError(f"cannot handle exponent {exponent}")
+
+    def lazy_pow(self, exponent):
+        """Returns self**exponent as a FreeGroupPower, without expanding it."""
+        n = int(exponent)
+        if n != exponent:
+            raise ValueError(f"cannot handle exponent {exponent}")
+        u, c = _cyclic_decomposition(self.value)
+        return FreeGroupPower(u, c, n)
+
+
+def _inverse(value):
+    return [(g, -e) for g, e in reversed(value)]
+
+
+def _product_hashes(a, b, i, middle, j):
+    """Returns the hashes of a[:i] + middle + b[j:] and its inverse.
+
+    Only the syllables removed by free reduction are rehashed.
+    """
+    tail = a.value[i:]
+    head = b.value[:j]
+    r = len(tail)
+    s = len(b.value) - j
+    prefix = (a._hash - pow(_B, i, _P) * _poly_hash(tail)) % _P
+    prefix_inv = (a._inv_hash - _poly_hash(_inverse(tail))) * pow(_B_INV, r, _P) % _P
+    suffix = (b._hash - _poly_hash(head)) * pow(_B_INV, j, _P) % _P
+    suffix_inv = (b._inv_hash - pow(_B, s, _P) * _poly_hash(_inverse(head))) % _P
+    m = pow(_B, len(middle), _P)
+    h = prefix + pow(_B, i, _P) * (_poly_hash(middle) + m * suffix)
+    h_inv = suffix_inv + pow(_B, s, _P) * (_poly_hash(_inverse(middle)) + m * prefix_inv)
+    return h % _P, h_inv % _P
+
+
+def _cyclic_decomposition(value):
+    """Returns (u, c) such that value == u c u⁻¹ and c is cyclically reduced."""
+    i = 0
+    j = len(value) - 1
+    while i < j:
+        x, m = value[i]
+        y, n = value[j]
+        if x != y:
+            break
+        if m + n != 0:
+            # x^m v x^n == x^m (v x^(m+n)) x^-m
+            return value[: i + 1], value[i + 1 : j] + [(x, m + n)]
+        i += 1
+        j -= 1
+    return value[:i], value[i : j + 1]
+
+
+class FreeGroupPower:
+    """The word u c^n u⁻¹, where c is cyclically reduced, with c^n kept unexpanded."""
+
+    def __init__(self, u, c, n):
+        self.u = u
+        self.c = c
+        self.n = n
+
+    def __repr__(self):
+        if not self.n or not self.c:
+            return "1"
+        u = FreeGroupElement(self.u)
+        c = FreeGroupElement(self.c)
+        power = f"({c}){superscript(self.n)}"
+        if not self.u:
+            return power
+        return f"{u} {power} {u.inv()}"
+
+    def _block(self):
+        """Returns the syllables of c^sign(n) and the number of times they repeat."""
+        n = self.n
+        c = self.c if n > 0 else _inverse(self.c)
+        if len(c) == 1:
+            g, e = c[0]
+            return [(g, e * abs(n))], 1
+        return c, abs(n)
+
+    def __iter__(self):
+        if not self.n or not self.c:
+            return
+        block, k = self._block()
+        syllables = itertools.chain(
+            self.u,
+            itertools.chain.from_iterable(itertools.repeat(block, k)),
+            _inverse(self.u),
+        )
+        # Since c is cyclically reduced, at most one syllable is merged at
+        # each junction and nothing cancels completely.
+        pending = next(syllables)
+        for g, e in syllables:
+            if g == pending[0]:
+                pending = g, pending[1] + e
+            else:
+                yield pending
+                pending = g, e
+        yield pending
+
+    def __len__(self):
+        if not self.n or not self.c:
+            return 0
+        block, k = self._block()
+        length = 2 * len(self.u) + k * len(block)
+        if self.u:
+            length -= self.u[-1][0] == block[0][0]
+            length -= block[-1][0] == self.u[-1][0]
+        return length
+
+    def expand(self):
+        return FreeGroupElement(list(self))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, FreeGroupPower) and self.u == other.u and self.c == other.c:
+            return self.n == other.n or not self.c
+        if isinstance(other, FreeGroupPower):
+            other = list(other)
+        else:
+            other = other.value
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return _poly_hash(self)
+
+    def inv(self):
+        return FreeGroupPower(self.u, self.c, -self.n)
 
     def __pow__(self, exponent, mod=None):
         n = int(exponent)
         if n == exponent:
-            one = FreeGroupElement([])
-            result = times_integer_power(one, self, abs(n))
-            if n < 0:
-                result = result.inv()
-            return result
+            return FreeGroupPower(self.u, self.c, self.n * n)
         raise ValueError(f"cannot handle exponent {exponent}")
@@ -0,0 +1,132 @@
+"""Homomorphisms from free groups into other groups."""
+
+import numpy as np
+
+from .cayley import CayleyTable
+from .free_group import FreeGroupElement
+from .memo import Memoized
+from .overload import GroupWrapper
+from .power import group_integer_power
+
+# The trie of shared prefixes in evaluate_many is discarded and started over
+# once it has this many nodes.
+TRIE_LIMIT = 1 << 20
+
+# At most this many images of syllables are cached, least recently used first out.
+IMAGE_LIMIT = 1 << 16
+
+
+def _syllables(word):
+    if isinstance(word, FreeGroupElement):
+        return word.value
+    return word
+
+
+class Homomorphism:
+    """The homomorphism from the free group F into target that maps generators to images.
+
+    Images are given as a mapping from generators to elements of target, or
+    as a sequence in the order of the generators of F. Words are evaluated
+    syllable by syllable, and the image of each syllable g^e is computed
+    with fast powering and kept in a cache of at most IMAGE_LIMIT images.
+    """
+
+    def __init__(self, F, target, images):
+        self.F = F
+        self.target = target
+        generators = F._generators
+        if not hasattr(images, "keys"):
+            images = list(images)
+            assert len(images) == len(generators)
+            images = dict(zip(generators, images))
+        assert set(images) == set(generators)
+        self._images = dict(images)
+        self._powers = Memoized(self._power, IMAGE_LIMIT)
+
+    def __repr__(self):
+        return f"Homomorphism({self.F!r}, {self.target!r})"
+
+    def image(self, g, exponent=1):
+        """Returns the image of the syllable g^exponent."""
+        return self._powers(g, exponent)
+
+    def _power(self, g, exponent):
+        x = self._images[g]
+        if hasattr(self.target, "rep"):
+            return self.target.rep(x, exponent)
+        return group_integer_power(self.target, x, exponent)
+
+    def evaluate(self, word):
+        """Returns the image of word, a FreeGroupElement or a sequence of syllables."""
+        op = self.target.op
+        a = self.target.identity()
+        for g, e in _syllables(word):
+            a = op(a, self.image(g, e))
+        return a
+
+    __call__ = evaluate
+
+    def evaluate_many(self, words):
+        """Returns the images of words.
+
+        If the target is a CayleyTable, the result is an array of indices and
+        the words are evaluated together with vectorized table lookups. If it
+        wraps a CayleyTable, the same lookups give a list of wrapped elements.
+        Otherwise the result is a list, and the images of prefixes that words
+        share are computed only once, using a trie of syllables of at most
+        TRIE_LIMIT nodes.
+        """
+        T = self.target
+        if isinstance(T, CayleyTable):
+            return self._evaluate_table(T, words, lambda x: x)
+        if isinstance(T, GroupWrapper) and isinstance(T.G, CayleyTable):
+            codes = self._evaluate_table(T.G, words, lambda x: x.value)
+            elements = list(T)
+            return [elements[i] for i in codes.tolist()]
+        op = T.op
+        identity = T.identity()
+        root = {}
+        nodes = 0
+        results = []
+        for word in words:
+            if nodes >= TRIE_LIMIT:
+                root = {}
+                nodes = 0
+            node = root
+            a = identity
+            for s in _syllables(word):
+                entry = node.get(s)
+                if entry is None:
+                    a = op(a, self.image(*s))
+                    child = {}
+                    node[s] = a, child
+                    nodes += 1
+                else:
+                    a, child = entry
+                node = child
+            results.append(a)
+        return results
+
+    def _evaluate_table(self, T, words, index):
+        """Returns the array of indices in the CayleyTable T of the images of words.
+
+        The images of all syllables are kept in one flat array. Column j of
+        the product only involves the words longer than j, which are a
+        prefix when the words are sorted by decreasing length.
+        """
+        flat = []
+        lengths = []
+        for word in words:
+            before = len(flat)
+            flat.extend(index(self.image(g, e)) for g, e in _syllables(word))
+            lengths.append(len(flat) - before)
+        flat = np.array(flat, dtype=np.intp)
+        lengths = np.array(lengths, dtype=np.intp)
+        starts = np.cumsum(lengths) - lengths
+        order = np.argsort(-lengths, kind="stable")
+        descending = lengths[order]
+        result = np.full(len(lengths), T.identity(), dtype=np.intp)
+        for j in range(descending[0] if len(descending) else 0):
+            active = order[: np.searchsorted(-descending, -j)]
+            result[active] = T.table[result[active], flat[starts[active] + j]]
+        return result
@@ -0,0 +1,149 @@
+"""Memoization of expensive operations on hashable arguments."""
+
+from collections import OrderedDict
+
+
+class Memoized:
+    """The function f with a cache of its results.
+
+    If maxsize is not None, at most maxsize results are kept and the least
+    recently used result is evicted first. If the list of elements is given,
+    the cache is promoted to a dense table over elements**arity once it
+    holds every tuple of arguments, or when promote is called.
+    """
+
+    def __init__(self, f, maxsize=None, *, elements=None, arity=2):
+        assert maxsize is None or maxsize > 0
+        self.f = f
+        self.maxsize = maxsize
+        self.arity = arity
+        self.elements = None if elements is None else list(elements)
+        self._members = None if elements is None else set(self.elements)
+        # The number of cached tuples of arguments that are all elements.
+        self._members_cached = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        self._index = None
+        self._table = None
+
+    def __repr__(self):
+        return f"Memoized({self.f!r})"
+
+    def __call__(self, *args):
+        if self._table is not None:
+            value = self._table
+            for a in args:
+                i = self._index.get(a)
+                if i is None:
+                    # Arguments outside the elements are not tabulated.
+                    self.misses += 1
+                    return self.f(*args)
+                value = value[i]
+            self.hits += 1
+            return value
+        cache = self._cache
+        value = cache.get(args, cache)
+        if value is not cache:
+            self.hits += 1
+            cache.move_to_end(args)
+            return value
+        self.misses += 1
+        value = self.f(*args)
+        cache[args] = value
+        if self._members is not None and self._in_domain(args):
+            self._members_cached += 1
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            evicted, _ = cache.popitem(last=False)
+            self.evictions += 1
+            if self._members is not None and self._in_domain(evicted):
+                self._members_cached -= 1
+        elif self._members is not None and self._complete():
+            self.promote()
+        return value
+
+    def _in_domain(self, args):
+        return all(a in self._members for a in args)
+
+    def _complete(self):
+        return self._members_cached == len(self._members) ** self.arity
+
+    def promote(self):
+        """Replaces the cache by a dense table over elements**arity."""
+        assert self.elements is not None
+        if self._table is not None:
+            return
+
+        def tabulate(prefix, depth):
+            if depth == self.arity:
+                value = self._cache.get(prefix, self._cache)
+                if value is self._cache:
+                    self.misses += 1
+                    value = self.f(*prefix)
+                return value
+            return [tabulate(prefix + (a,), depth + 1) for a in self.elements]
+
+        self._index = {a: i for i, a in enumerate(self.elements)}
+        self._table = tabulate((), 0)
+        self._cache.clear()
+        self._members_cached = 0
+
+    def promoted(self):
+        return self._table is not None
+
+    def clear(self):
+        """Discards all cached results, including a dense table."""
+        self._cache.clear()
+        self._members_cached = 0
+        self._index = None
+        self._table = None
+
+    def stats(self):
+        """Returns a dict of the numbers of hits, misses, evictions and cached results."""
+        if self._table is not None:
+            size = len(self.elements) ** self.arity
+        else:
+            size = len(self._cache)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size,
+        }
+
+
+def memoize(f, option, *, elements=None, arity=2):
+    """Returns f memoized according to option.
+
+    The option is False or None for no memoization, True for an unbounded
+    cache, or the maximum number of cached results.
+    """
+    if option is None or option is False:
+        return f
+    maxsize = None if option is True else option
+    return Memoized(f, maxsize, elements=elements, arity=arity)
+
+
+class MemoizedGroup:
+    """The group G with memoized op and inv."""
+
+    def __init__(self, G, maxsize=None, *, elements=None):
+        self.G = G
+        self.op = Memoized(G.op, maxsize, elements=elements, arity=2)
+        self.inv = Memoized(G.inv, maxsize, elements=elements, arity=1)
+
+    def __getattr__(self, attr):
+        # Guard against recursion while unpickling, before G is set.
+        if attr == "G" or attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.G, attr)
+
+    def __repr__(self):
+        return repr(self.G)
+
+    def __iter__(self):
+        return iter(self.G)
+
+    def stats(self):
+        return {"op": self.op.stats(), "inv": self.inv.stats()}
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def bezout(a, b):
     """Find (x, y, g) such that ax + by = g = gcd(a, b)."""
     if b == 0:
@@ -26,3 +29,133 @@ def crt(a, m, b, n):
     c = (a * y * n + b * x * m) // gcd
     lcm = m * n // gcd
     return c % lcm, lcm
+
+
+def crt_combine(residues, moduli):
+    """Find (c, lcm(moduli)) such that c ≡ residues[k] (mod moduli[k]) for all k.
+
+    Congruences are combined pairwise along a balanced binary tree, so that
+    intermediate moduli stay balanced in size.
+    """
+    congruences = list(zip(residues, moduli))
+    if not congruences:
+        return 0, 1
+    while len(congruences) > 1:
+        combined = [
+            crt(a, m, b, n) for (a, m), (b, n) in zip(congruences[::2], congruences[1::2])
+        ]
+        if len(congruences) % 2:
+            combined.append(congruences[-1])
+        congruences = combined
+    [(c, m)] = congruences
+    return c % m, m
+
+
+def bezout_many(a, b):
+    """Vectorized bezout: find arrays (x, y, g) with a*x + b*y = g elementwise.
+
+    The results agree elementwise with bezout. Arguments must fit into
+    int64.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+    shape = a.shape
+    a = a.flatten()
+    b = b.flatten()
+    prev_x, x = np.ones_like(a), np.zeros_like(a)
+    prev_y, y = np.zeros_like(a), np.ones_like(a)
+    zero = b == 0
+    x[zero] = 1
+    y[zero] = 0
+    b[zero] = a[zero]
+    active = ~zero
+    while active.any():
+        quotient, remainder = np.divmod(a[active], b[active])
+        done = remainder == 0
+        index = np.flatnonzero(active)
+        active[index[done]] = False
+        index = index[~done]
+        quotient = quotient[~done]
+        a[index], b[index] = b[index], remainder[~done]
+        prev_x[index], x[index] = x[index], prev_x[index] - quotient * x[index]
+        prev_y[index], y[index] = y[index], prev_y[index] - quotient * y[index]
+    return x.reshape(shape), y.reshape(shape), b.reshape(shape)
+
+
+def crt_many(a, m, b, n):
+    """Vectorized crt: find arrays (c, lcm(m, n)) with c ≡ a (mod m) and c ≡ b (mod n).
+
+    All moduli must be positive, and lcm(m, n) as well as n² must fit into
+    int64.
+    """
+    a, m, b, n = np.broadcast_arrays(*(np.asarray(v, dtype=np.int64) for v in (a, m, b, n)))
+    assert (m >= 1).all()
+    assert (n >= 1).all()
+    x, _, gcd = bezout_many(m, n)
+    x = np.where(gcd < 0, -x, x)
+    gcd = abs(gcd)
+    bad = a % gcd != b % gcd
+    if bad.any():
+        k = np.flatnonzero(bad)[0]
+        x, y, g = a.flat[k], b.flat[k], gcd.flat[k]
+        raise ValueError(f"No solution, because {x} ≢ {y} (mod {g})")
+    # m x ≡ g (mod n), so a + m x (b - a) / g ≡ b (mod n).
+    a = a % m
+    n_g = n // gcd
+    lcm = m * n_g
+    c = a + m * ((b - a) // gcd % n_g * (x % n_g) % n_g)
+    return c % lcm, lcm
+
+
+def inverse(a, n):
+    """Find x such that ax ≡ 1 (mod n)."""
+    assert n >= 1
+    x, _, g = bezout(a % n, n)
+    if g not in (1, -1):
+        raise ValueError(f"{a} is not invertible modulo {n}")
+    return x * g % n
+
+
+def inverse_many(values, n):
+    """Find the list of inverses modulo n of values.
+
+    Uses Montgomery's trick: a single call to inverse for the product of all
+    values, followed by three multiplications per value.
+    """
+    values = [a % n for a in values]
+    prefix = []
+    product = 1
+    for a in values:
+        prefix.append(product)
+        product = product * a % n
+    try:
+        x = inverse(product, n)
+    except ValueError:
+        for a in values:
+            inverse(a, n)
+        raise
+    result = [0] * len(values)
+    for k in range(len(values) - 1, -1, -1):
+        result[k] = x * prefix[k] % n
+        x = x * values[k] % n
+    return result
+
+
+def factorize(n):
+    """Find the list of (p, e) such that n is the product of the prime powers p**e.
+
+    Uses trial division, so n should have no more than one large prime factor.
+    """
+    assert n >= 1
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors.append((p, e))
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors.append((n, 1))
+    return factors
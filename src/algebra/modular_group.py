@@ -0,0 +1,216 @@
+"""The cyclic groups Z/nZ and the unit groups (Z/nZ)ˣ of residues modulo n."""
+
+import math
+
+import numpy as np
+
+from .format import subscript
+from .modular import factorize, inverse, inverse_many
+from .overload import Additive, Multiplicative
+
+# Unit groups with a modulus up to this limit precompute a table of inverses.
+TABLE_LIMIT = 1 << 16
+
+
+def Z(n):
+    assert n >= 1
+    return Additive(Zmod(n))
+
+
+def U(n, *, table=None):
+    assert n >= 1
+    return Multiplicative(Units(n, table=table))
+
+
+def _dtype(n):
+    """Returns a dtype that can hold products of two residues modulo n."""
+    return np.int64 if (n - 1) ** 2 < 1 << 63 else object
+
+
+def _integer(exponent):
+    k = int(exponent)
+    if k != exponent:
+        raise ValueError(f"cannot handle exponent {exponent}")
+    return k
+
+
+def _totient(n):
+    return math.prod(p ** (e - 1) * (p - 1) for p, e in factorize(n))
+
+
+class Zmod:
+    """The residues 0, ..., n-1 under addition modulo n."""
+
+    def __init__(self, n):
+        assert n >= 1
+        self._n = n
+        self._dtype = _dtype(n)
+
+    def __repr__(self):
+        return f"Z{subscript(self._n)}"
+
+    def modulus(self):
+        return self._n
+
+    def order(self):
+        return self._n
+
+    def element_order(self, a):
+        return self._n // math.gcd(a, self._n)
+
+    def __iter__(self):
+        return iter(range(self._n))
+
+    def generators(self):
+        yield 1 % self._n
+
+    def identity(self):
+        return 0
+
+    def inv(self, a):
+        return -a % self._n
+
+    def op(self, a, b):
+        return (a + b) % self._n
+
+    def rep(self, a, exponent):
+        return a * _integer(exponent) % self._n
+
+    def encode(self, a):
+        return a
+
+    def decode(self, code):
+        return int(code)
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of residues."""
+        return (np.asarray(a, dtype=self._dtype) + np.asarray(b, dtype=self._dtype)) % self._n
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of residues."""
+        return -np.asarray(a, dtype=self._dtype) % self._n
+
+    def rep_many(self, a, exponent):
+        """Vectorized integer multiples of an array of residues."""
+        # Reduce first, so that exponents may be arbitrary Python integers.
+        exponent = np.asarray(np.asarray(exponent) % self._n, dtype=self._dtype)
+        return np.asarray(a, dtype=self._dtype) * exponent % self._n
+
+
+class Units:
+    """The residues modulo n that are coprime to n, under multiplication.
+
+    Inverses are looked up in a precomputed table if table is true, which is
+    the default for moduli up to TABLE_LIMIT. Otherwise they are computed
+    with the extended Euclidean algorithm, once per batch for inv_many.
+    """
+
+    def __init__(self, n, *, table=None):
+        assert n >= 1
+        self._n = n
+        self._dtype = _dtype(n)
+        self._order = None
+        if table is None:
+            table = n <= TABLE_LIMIT
+        self._inverses = None
+        if table:
+            units = list(self)
+            inverses = np.zeros(n, dtype=np.int64)
+            inverses[units] = inverse_many(units, n)
+            self._inverses = inverses
+            self._inv = inverses.tolist()
+
+    def __repr__(self):
+        return f"U{subscript(self._n)}"
+
+    def modulus(self):
+        return self._n
+
+    def order_bound(self):
+        """Returns n, a bound on the order that does not require factoring n."""
+        return self._n
+
+    def order(self):
+        """Returns Euler's totient of n, which requires factoring n."""
+        if self._order is None:
+            self._order = _totient(self._n)
+        return self._order
+
+    def __iter__(self):
+        n = self._n
+        for a in range(n):
+            if math.gcd(a, n) == 1:
+                yield a
+
+    def generators(self):
+        """Yields the units that are not in the subgroup generated by the smaller ones."""
+        n = self._n
+        order = self.order()
+        H = {1 % n}
+        for a in self:
+            if len(H) == order:
+                return
+            if a in H:
+                continue
+            yield a
+            # The group is abelian, so H⟨a⟩ is the union of the cosets H aᵏ.
+            cosets = []
+            x = a
+            while x not in H:
+                cosets.append({h * x % n for h in H})
+                x = x * a % n
+            for coset in cosets:
+                H |= coset
+
+    def identity(self):
+        return 1 % self._n
+
+    def inv(self, a):
+        if self._inverses is not None:
+            return self._inv[a]
+        return inverse(a, self._n)
+
+    def op(self, a, b):
+        return a * b % self._n
+
+    def rep(self, a, exponent):
+        k = _integer(exponent)
+        if k < 0:
+            return pow(self.inv(a), -k, self._n)
+        return pow(a, k, self._n)
+
+    def encode(self, a):
+        return a
+
+    def decode(self, code):
+        return int(code)
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of residues."""
+        return np.asarray(a, dtype=self._dtype) * np.asarray(b, dtype=self._dtype) % self._n
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of residues."""
+        a = np.asarray(a, dtype=self._dtype)
+        if self._inverses is not None:
+            return self._inverses[a]
+        inverses = inverse_many(a.ravel().tolist(), self._n)
+        return np.array(inverses, dtype=self._dtype).reshape(a.shape)
+
+    def rep_many(self, a, exponent):
+        """Vectorized integer powers of an array of residues."""
+        n = self._n
+        a = np.asarray(a, dtype=self._dtype)
+        a, exponent = np.broadcast_arrays(a, np.asarray(exponent))
+        negative = exponent < 0
+        base = a.copy()
+        if negative.any():
+            base[negative] = self.inv_many(a[negative])
+        exponent = abs(exponent)
+        result = np.full(a.shape, 1 % n, dtype=self._dtype)
+        while np.any(exponent > 0):
+            odd = np.asarray(exponent & 1, dtype=bool)
+            result = np.where(odd, result * base % n, result)
+            base = base * base % n
+            exponent = exponent >> 1
+        return result
@@ -2,16 +2,67 @@
 
 import abc
 
-from .power import group_integer_power
+import numpy as np
 
+from .memo import MemoizedGroup
+from .power import element_order, group_integer_power
 
-class GroupWrapper:
-    """Group wrapper base class."""
 
-    def __init__(self, G):
+# Flyweights are only used for groups of at most this order.
+FLYWEIGHT_LIMIT = 1 << 16
+
+
+def _order_bound(G):
+    """Returns an upper bound on the order of G, or None if G has no order.
+
+    Groups whose order is expensive to compute may provide a cheap
+    order_bound method.
+    """
+    if hasattr(G, "order_bound"):
+        return G.order_bound()
+    if hasattr(G, "order"):
+        return G.order()
+    return None
+
+
+def _array(values):
+    """Returns a one-dimensional object array of values, which may be tuples."""
+    values = list(values)
+    result = np.empty(len(values), dtype=object)
+    result[:] = values
+    return result
+
+
+class GroupWrapper:
+    """Group wrapper base class.
+
+    For finite groups of order at most FLYWEIGHT_LIMIT, each distinct value
+    is wrapped by a single cached element object (a flyweight), unless
+    flyweight=False. The order is checked with order_bound, if G provides
+    it. In trusted mode, operations skip checking that their operands are
+    compatible elements. If memoize is True or a maximum cache size, the op
+    and inv of G are memoized with a MemoizedGroup, over the elements of G
+    if its order is at most FLYWEIGHT_LIMIT.
+    """
+
+    def __init__(self, G, *, trusted=False, flyweight=None, memoize=False):
+        if memoize:
+            # Finite groups get their op and inv promoted to dense tables
+            # once every result is cached.
+            bound = _order_bound(G)
+            elements = list(G) if bound is not None and bound <= FLYWEIGHT_LIMIT else None
+            G = MemoizedGroup(G, None if memoize is True else memoize, elements=elements)
         self.G = G
+        self.trusted = trusted
+        if flyweight is None:
+            bound = _order_bound(G)
+            flyweight = bound is not None and bound <= FLYWEIGHT_LIMIT
+        self._elements = {} if flyweight else None
 
     def __getattr__(self, attr):
+        # Guard against recursion while unpickling, before G is set.
+        if attr == "G" or attr.startswith("__"):
+            raise AttributeError(attr)
         return getattr(self.G, attr)
 
     def __repr__(self):
@@ -20,6 +71,15 @@ class GroupWrapper:
     def __str__(self):
         return f"{self.NAME}({self.G})"
 
+    def _element(self, cls, value):
+        elements = self._elements
+        if elements is None:
+            return cls(self.G, value, self)
+        a = elements.get(value)
+        if a is None:
+            a = elements[value] = cls(self.G, value, self)
+        return a
+
     @abc.abstractmethod
     def _wrap(self, value):
         pass
@@ -36,18 +96,81 @@ class GroupWrapper:
         return self._wrap(self.G.identity())
 
     def inv(self, a):
-        assert isinstance(a, MultiplicativeGroupElement)
+        assert self.trusted or isinstance(a, GroupElement)
         return a.inv()
 
     def op(self, a, b):
-        assert isinstance(a, MultiplicativeGroupElement)
-        assert isinstance(b, MultiplicativeGroupElement)
+        assert self.trusted or isinstance(a, GroupElement)
+        assert self.trusted or isinstance(b, GroupElement)
         return a.op(b)
 
     def rep(self, a, multiplicity):
-        assert isinstance(a, MultiplicativeGroupElement)
+        assert self.trusted or isinstance(a, GroupElement)
         return a.rep(multiplicity)
 
+    @property
+    def element_order(self):
+        # Only finite groups that provide element_order have it wrapped, so
+        # that group_integer_power does not reduce exponents otherwise.
+        G = self.G
+        if not hasattr(G, "element_order") or not G.order() < float("inf"):
+            raise AttributeError("element_order")
+        return self._element_order
+
+    def _element_order(self, a):
+        assert self.trusted or isinstance(a, GroupElement)
+        return self.G.element_order(a.value)
+
+    # Batch operations work on arrays of encoded elements, as produced by the
+    # encode method of the underlying group, or on arrays of raw values if it
+    # has none. Groups whose values already are their codes, such as
+    # CayleyTable, set CODES_ARE_VALUES. Groups may provide vectorized
+    # op_many, inv_many and rep_many.
+
+    def _decode_many(self, codes):
+        if getattr(self.G, "CODES_ARE_VALUES", False):
+            return [int(c) for c in codes]
+        if hasattr(self.G, "decode"):
+            return [self.G.decode(c) for c in codes]
+        return list(codes)
+
+    def _encode_many(self, values):
+        if getattr(self.G, "CODES_ARE_VALUES", False):
+            return np.array(list(values), dtype=np.intp)
+        if hasattr(self.G, "encode"):
+            return np.array([self.G.encode(a) for a in values], dtype=np.intp)
+        return _array(values)
+
+    def encode_many(self, elements):
+        """Returns the array of codes of wrapped elements."""
+        return self._encode_many(a.value for a in elements)
+
+    def decode_many(self, codes):
+        """Returns the list of wrapped elements for an array of codes."""
+        return [self._wrap(a) for a in self._decode_many(codes)]
+
+    def op_many(self, a, b):
+        if hasattr(self.G, "op_many"):
+            return self.G.op_many(a, b)
+        a, b = self._decode_many(a), self._decode_many(b)
+        return self._encode_many(self.G.op(x, y) for x, y in zip(a, b))
+
+    def inv_many(self, a):
+        if hasattr(self.G, "inv_many"):
+            return self.G.inv_many(a)
+        return self._encode_many(self.G.inv(x) for x in self._decode_many(a))
+
+    def rep_many(self, a, multiplicity):
+        if hasattr(self.G, "rep_many"):
+            return self.G.rep_many(a, multiplicity)
+        a = self._decode_many(a)
+        multiplicity = np.broadcast_to(np.asarray(multiplicity, dtype=object), (len(a),))
+        if hasattr(self.G, "rep"):
+            values = (self.G.rep(x, k) for x, k in zip(a, multiplicity))
+        else:
+            values = (group_integer_power(self.G, x, k) for x, k in zip(a, multiplicity))
+        return self._encode_many(values)
+
 
 class Multiplicative(GroupWrapper):
     """Group wrapper that adds multiplicative overloads to elements."""
@@ -55,7 +178,7 @@ class Multiplicative(GroupWrapper):
     NAME = "Multiplicative"
 
     def _wrap(self, value):
-        return MultiplicativeGroupElement(self.G, value)
+        return self._element(MultiplicativeGroupElement, value)
 
     def one(self):
         return self.identity()
@@ -67,7 +190,7 @@ class Additive(GroupWrapper):
     NAME = "Additive"
 
     def _wrap(self, value):
-        return AdditiveGroupElement(self.G, value)
+        return self._element(AdditiveGroupElement, value)
 
     def zero(self):
         return self.identity()
@@ -75,9 +198,13 @@ class Additive(GroupWrapper):
 
 class GroupElement:
 
-    def __init__(self, G, value):
+    __slots__ = ("G", "value", "W", "_hash")
+
+    def __init__(self, G, value, W=None):
         self.G = G
         self.value = value
+        self.W = W
+        self._hash = None
 
     def __eq__(self, other):
         return self is other or (self.G == other.G and self.value == other.value)
@@ -86,23 +213,37 @@ class GroupElement:
         return not (self == other)
 
     def __hash__(self):
-        return hash(self.G) ^ hash(self.value)
+        if self._hash is None:
+            self._hash = hash(self.value)
+        return self._hash
+
+    def __reduce__(self):
+        # The wrapper and its flyweight cache are not pickled.
+        return type(self), (self.G, self.value)
 
     def __repr__(self):
         if hasattr(self.G, "pretty"):
             return self.G.pretty(self.value)
         return repr(self.value)
 
-    @abc.abstractmethod
     def _wrap(self, value):
-        pass
+        W = self.W
+        if W is None:
+            return type(self)(self.G, value)
+        # Inlined flyweight lookup for the common case.
+        if W._elements is not None:
+            a = W._elements.get(value)
+            if a is not None:
+                return a
+        return W._wrap(value)
 
     def inv(self):
         return self._wrap(self.G.inv(self.value))
 
     def op(self, other):
-        assert type(self) is type(other)
-        assert self.G == other.G
+        if self.W is None or not self.W.trusted:
+            assert type(self) is type(other)
+            assert self.G == other.G
         return self._wrap(self.G.op(self.value, other.value))
 
     def rep(self, multiplicity):
@@ -112,11 +253,14 @@ class GroupElement:
             value = group_integer_power(self.G, self.value, multiplicity)
         return self._wrap(value)
 
+    def order(self):
+        """Returns the order of this element of a finite group."""
+        return element_order(self.G, self.value)
+
 
 class MultiplicativeGroupElement(GroupElement):
 
-    def _wrap(self, value):
-        return MultiplicativeGroupElement(self.G, value)
+    __slots__ = ()
 
     def __mul__(self, other):
         return self.op(other)
@@ -135,8 +279,7 @@ class MultiplicativeGroupElement(GroupElement):
 
 class AdditiveGroupElement(GroupElement):
 
-    def _wrap(self, value):
-        return AdditiveGroupElement(self.G, value)
+    __slots__ = ()
 
     def __add__(self, other):
         return self.op(other)
@@ -0,0 +1,153 @@
+"""Free groups whose words are stored in packed arrays.
+
+Generators are interned to small integers and the syllables of a word are
+kept in two parallel arrays of generator indices and exponents. Words are
+views [start, stop) into these arrays, and arrays are shared between words
+where possible: taking a prefix or suffix copies nothing, and appending to a
+word that ends at the end of its arrays extends them in place, leaving every
+existing view unchanged.
+"""
+
+from array import array
+import operator
+
+from .format import superscript
+from .free_group import FreeGroup, FreeGroupElement
+from .power import times_integer_power
+
+
+class PackedFreeGroup(FreeGroup):
+
+    def __init__(self, generators):
+        super().__init__(generators)
+        self._index = {g: i for i, g in enumerate(self._generators)}
+        assert len(self._index) == len(self._generators)
+
+    def __repr__(self):
+        d = ", ".join(str(g) for g in self._generators)
+        return f"PackedFreeGroup({d})"
+
+    def generators(self):
+        for i in range(len(self._generators)):
+            yield PackedWord(self, array("i", [i]), array("l", [1]), 0, 1)
+
+    def identity(self):
+        return PackedWord(self, array("i"), array("l"), 0, 0)
+
+    def inv(self, a):
+        assert isinstance(a, PackedWord)
+        return a.inv()
+
+    def op(self, a, b):
+        assert isinstance(a, PackedWord)
+        assert isinstance(b, PackedWord)
+        return a * b
+
+    def rep(self, a, n):
+        assert isinstance(a, PackedWord)
+        return a**n
+
+    def pack(self, a):
+        """Converts a FreeGroupElement into a PackedWord."""
+        gens = array("i", [self._index[g] for g, _ in a.value])
+        exps = array("l", [e for _, e in a.value])
+        return PackedWord(self, gens, exps, 0, len(gens))
+
+
+class PackedWord:
+
+    __slots__ = ("G", "_gens", "_exps", "_start", "_stop")
+
+    def __init__(self, G, gens, exps, start, stop):
+        self.G = G
+        self._gens = gens
+        self._exps = exps
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __iter__(self):
+        names = self.G._generators
+        for i in range(self._start, self._stop):
+            yield names[self._gens[i]], self._exps[i]
+
+    def __repr__(self):
+        if self._start == self._stop:
+            return "1"
+        return " ".join(f"{g}" if e == 1 else f"{g}{superscript(e)}" for g, e in self)
+
+    def _slices(self):
+        return self._gens[self._start : self._stop], self._exps[self._start : self._stop]
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if self.G != other.G or len(self) != len(other):
+            return False
+        return self._slices() == other._slices()
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        gens, exps = self._slices()
+        return hash((gens.tobytes(), exps.tobytes()))
+
+    def unpack(self):
+        """Converts this word into a FreeGroupElement."""
+        return FreeGroupElement(list(self))
+
+    def inv(self):
+        gens, exps = self._slices()
+        gens = gens[::-1]
+        exps = array("l", map(operator.neg, exps[::-1]))
+        return PackedWord(self.G, gens, exps, 0, len(gens))
+
+    def __mul__(self, other):
+        if self._start == self._stop:
+            return other
+        if other._start == other._stop:
+            return self
+        a_gens, a_exps = self._gens, self._exps
+        b_gens, b_exps = other._gens, other._exps
+        i = self._stop
+        j = other._start
+        merged = None
+        while i > self._start and j < other._stop:
+            x = a_gens[i - 1]
+            if x != b_gens[j]:
+                break
+            k = a_exps[i - 1] + b_exps[j]
+            i -= 1
+            j += 1
+            if k != 0:
+                merged = x, k
+                break
+        if merged is None:
+            if i == self._start:
+                return PackedWord(self.G, b_gens, b_exps, j, other._stop)
+            if j == other._stop:
+                return PackedWord(self.G, a_gens, a_exps, self._start, i)
+            if i == len(a_gens):
+                a_gens += b_gens[j : other._stop]
+                a_exps += b_exps[j : other._stop]
+                return PackedWord(self.G, a_gens, a_exps, self._start, len(a_gens))
+        gens = a_gens[self._start : i]
+        exps = a_exps[self._start : i]
+        if merged is not None:
+            gens.append(merged[0])
+            exps.append(merged[1])
+        gens += b_gens[j : other._stop]
+        exps += b_exps[j : other._stop]
+        return PackedWord(self.G, gens, exps, 0, len(gens))
+
+    def __pow__(self, exponent, mod=None):
+        n = int(exponent)
+        if n == exponent:
+            result = times_integer_power(self.G.identity(), self, abs(n))
+            if n < 0:
+                result = result.inv()
+            return result
+        raise ValueError(f"cannot handle exponent {exponent}")
@@ -1,3 +1,8 @@
+import weakref
+
+from .modular import factorize
+
+
 def times_integer_power(a, b, exponent):
     """Returns a * b**exponent for non-negative integer exponents."""
     n = int(exponent)
@@ -11,11 +16,35 @@ def times_integer_power(a, b, exponent):
     return a
 
 
+# Exponents with more bits than this use sliding windows.
+WINDOW_THRESHOLD = 32
+
+
+def _window_width(bits):
+    """Returns the window width that minimizes the number of group operations."""
+    width = 1
+    for limit in (8, 24, 80, 240, 672):
+        if bits <= limit:
+            break
+        width += 1
+    return width
+
+
 def group_integer_power(G, b, exponent):
-    """Returns b**exponent for integer exponents."""
+    """Returns b**exponent for integer exponents.
+
+    If G is finite and provides element_order, the exponent is first reduced
+    modulo the order of b. Exponents longer than WINDOW_THRESHOLD bits are handled by
+    window_integer_power.
+    """
     n = int(exponent)
     if n != exponent:
         raise ValueError(f"cannot handle exponent {exponent}")
+    if hasattr(G, "element_order") and G.order() < float("inf"):
+        n %= G.element_order(b)
+        exponent = n
+    if n.bit_length() > WINDOW_THRESHOLD:
+        return window_integer_power(G, b, n)
     n = abs(n)
     a = G.identity()
     while n > 0:
@@ -26,3 +55,116 @@ def group_integer_power(G, b, exponent):
     if exponent < 0:
         a = G.inv(a)
     return a
+
+
+def window_integer_power(G, b, exponent, width=None):
+    """Returns b**exponent for integer exponents, using sliding windows.
+
+    The odd powers b, b³, ..., b^(2^width - 1) are precomputed, after which
+    each window of up to width bits of the exponent costs one op besides the
+    squarings.
+    """
+    n = int(exponent)
+    if n != exponent:
+        raise ValueError(f"cannot handle exponent {exponent}")
+    if n < 0:
+        b = G.inv(b)
+        n = -n
+    if n == 0:
+        return G.identity()
+    if width is None:
+        width = _window_width(n.bit_length())
+    odd = [b]
+    if width > 1:
+        b2 = G.op(b, b)
+        for _ in range((1 << (width - 1)) - 1):
+            odd.append(G.op(odd[-1], b2))
+    a = None
+    i = n.bit_length() - 1
+    while i >= 0:
+        if not (n >> i) & 1:
+            a = G.op(a, a)
+            i -= 1
+            continue
+        # The longest window n[i:j] of at most width bits that ends in a 1.
+        j = max(i - width + 1, 0)
+        while not (n >> j) & 1:
+            j += 1
+        digit = (n >> j) & ((1 << (i - j + 1)) - 1)
+        if a is None:
+            a = odd[digit >> 1]
+        else:
+            for _ in range(i - j + 1):
+                a = G.op(a, a)
+            a = G.op(a, odd[digit >> 1])
+        i = j - 1
+    return a
+
+
+def multi_integer_power(G, bases, exponents, width=None):
+    """Returns the product of b**e over corresponding bases and integer exponents.
+
+    Uses Straus's method: all powers share a single sequence of squarings, and
+    each window of width bits of each exponent costs one op. Since the order
+    of the factors is not preserved, the bases must commute with each other.
+    """
+    terms = []
+    for b, exponent in zip(bases, exponents):
+        n = int(exponent)
+        if n != exponent:
+            raise ValueError(f"cannot handle exponent {exponent}")
+        if n < 0:
+            b = G.inv(b)
+            n = -n
+        if n:
+            terms.append((b, n))
+    if not terms:
+        return G.identity()
+    bits = max(n.bit_length() for _, n in terms)
+    if width is None:
+        width = max(1, _window_width(bits) - 1)
+    tables = []
+    for b, _ in terms:
+        table = [None, b]
+        for _ in range((1 << width) - 2):
+            table.append(G.op(table[-1], b))
+        tables.append(table)
+    mask = (1 << width) - 1
+    a = None
+    for shift in range((bits - 1) // width * width, -1, -width):
+        if a is not None:
+            for _ in range(width):
+                a = G.op(a, a)
+        for table, (_, n) in zip(tables, terms):
+            digit = (n >> shift) & mask
+            if digit:
+                a = table[digit] if a is None else G.op(a, table[digit])
+    return a
+
+
+# Orders of elements, cached per group.
+_orders = weakref.WeakKeyDictionary()
+
+
+def element_order(G, a):
+    """Returns the order of the element a of the finite group G.
+
+    Uses G.element_order if available. Otherwise the order of G is factored
+    and the order of a is found by removing prime factors p from it as long
+    as a**(order / p) is the identity. Results are cached per group.
+    """
+    if hasattr(G, "element_order"):
+        return G.element_order(a)
+    cache = _orders.setdefault(G, {})
+    order = cache.get(a)
+    if order is None:
+        order = G.order()
+        assert order < float("inf")
+        e = G.identity()
+        for p, k in factorize(order):
+            for _ in range(k):
+                if group_integer_power(G, a, order // p) != e:
+                    break
+                order //= p
+        cache[a] = order
+    return order
@@ -0,0 +1,231 @@
+"""Direct and semidirect products of groups.
+
+Elements of products are tuples of elements of the factors. If all factors
+are CayleyTables, elements are also encoded as integers in mixed radix, with
+the first factor most significant, and batch operations work on the codes
+factor by factor, without a Cayley table of the product.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from .cayley import CayleyTable
+from .power import element_order, group_integer_power
+
+
+def _pretty(G, a):
+    if hasattr(G, "pretty"):
+        return G.pretty(a)
+    return repr(a)
+
+
+def _power(G, a, exponent):
+    if hasattr(G, "rep"):
+        return G.rep(a, exponent)
+    return group_integer_power(G, a, exponent)
+
+
+class DirectProduct:
+    """The direct product of the groups G, H, ..., with componentwise operations."""
+
+    def __new__(cls, *factors):
+        tables = factors and all(isinstance(G, CayleyTable) for G in factors)
+        if cls is DirectProduct and tables:
+            cls = _EncodedDirectProduct
+        return super().__new__(cls)
+
+    def __init__(self, *factors):
+        assert factors
+        self.factors = factors
+
+    def __getnewargs__(self):
+        # Pickle and copy pass these to __new__, which picks the class.
+        return self.factors
+
+    def __repr__(self):
+        return " × ".join(repr(G) for G in self.factors)
+
+    def pretty(self, a):
+        return "(" + ", ".join(_pretty(G, x) for G, x in zip(self.factors, a)) + ")"
+
+    def order(self):
+        return math.prod(G.order() for G in self.factors)
+
+    def __iter__(self):
+        return itertools.product(*self.factors)
+
+    def generators(self):
+        identity = self.identity()
+        for k, G in enumerate(self.factors):
+            for x in G.generators():
+                yield identity[:k] + (x,) + identity[k + 1 :]
+
+    def identity(self):
+        return tuple(G.identity() for G in self.factors)
+
+    def inv(self, a):
+        return tuple(G.inv(x) for G, x in zip(self.factors, a))
+
+    def op(self, a, b):
+        return tuple(G.op(x, y) for G, x, y in zip(self.factors, a, b))
+
+    def rep(self, a, exponent):
+        return tuple(_power(G, x, exponent) for G, x in zip(self.factors, a))
+
+    def element_order(self, a):
+        return math.lcm(*(element_order(G, x) for G, x in zip(self.factors, a)))
+
+
+class _EncodedDirectProduct(DirectProduct):
+    """A direct product of CayleyTables, with mixed-radix codes."""
+
+    def __init__(self, *factors):
+        super().__init__(*factors)
+        self._radices = [len(G) for G in factors]
+
+    def encode(self, a):
+        code = 0
+        for x, radix in zip(a, self._radices):
+            code = code * radix + x
+        return code
+
+    def decode(self, code):
+        code = int(code)
+        digits = []
+        for radix in reversed(self._radices):
+            code, x = divmod(code, radix)
+            digits.append(x)
+        return tuple(reversed(digits))
+
+    def _split(self, codes):
+        codes = np.asarray(codes)
+        digits = []
+        for radix in reversed(self._radices):
+            codes, x = np.divmod(codes, radix)
+            digits.append(x)
+        return digits[::-1]
+
+    def _join(self, digits):
+        code = 0
+        for x, radix in zip(digits, self._radices):
+            code = code * radix + x
+        return code
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of codes."""
+        return self._join(
+            G.table[x, y] for G, x, y in zip(self.factors, self._split(a), self._split(b))
+        )
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of codes."""
+        return self._join(G.inverses[x] for G, x in zip(self.factors, self._split(a)))
+
+    def rep_many(self, a, exponent):
+        """Vectorized integer powers of an array of codes."""
+        digits = zip(self.factors, self._split(a))
+        return self._join(G.rep_many(x, exponent) for G, x in digits)
+
+
+class SemidirectProduct:
+    """The semidirect product N ⋊ H, where H acts on N by action(h, n).
+
+    For each h, n ↦ action(h, n) must be an automorphism of N, and h ↦ that
+    automorphism a homomorphism. Elements are pairs (n, h) with
+
+        (n₁, h₁) (n₂, h₂) = (n₁ action(h₁, n₂), h₁ h₂).
+
+    If N and H are CayleyTables, the action is tabulated once.
+    """
+
+    def __new__(cls, N, H, action):
+        tables = isinstance(N, CayleyTable) and isinstance(H, CayleyTable)
+        if cls is SemidirectProduct and tables:
+            cls = _EncodedSemidirectProduct
+        return super().__new__(cls)
+
+    def __init__(self, N, H, action):
+        self.N = N
+        self.H = H
+        self.action = action
+
+    def __getnewargs__(self):
+        # Pickle and copy pass these to __new__, which picks the class.
+        return self.N, self.H, self.action
+
+    def __repr__(self):
+        return f"{self.N!r} ⋊ {self.H!r}"
+
+    def pretty(self, a):
+        n, h = a
+        return f"({_pretty(self.N, n)}, {_pretty(self.H, h)})"
+
+    def order(self):
+        return self.N.order() * self.H.order()
+
+    def __iter__(self):
+        return itertools.product(self.N, self.H)
+
+    def generators(self):
+        for n in self.N.generators():
+            yield n, self.H.identity()
+        for h in self.H.generators():
+            yield self.N.identity(), h
+
+    def identity(self):
+        return self.N.identity(), self.H.identity()
+
+    def inv(self, a):
+        n, h = a
+        h = self.H.inv(h)
+        return self.action(h, self.N.inv(n)), h
+
+    def op(self, a, b):
+        n1, h1 = a
+        n2, h2 = b
+        return self.N.op(n1, self.action(h1, n2)), self.H.op(h1, h2)
+
+    def rep(self, a, exponent):
+        return group_integer_power(self, a, exponent)
+
+
+class _EncodedSemidirectProduct(SemidirectProduct):
+    """A semidirect product of CayleyTables, with codes n |H| + h."""
+
+    def __init__(self, N, H, action):
+        super().__init__(N, H, action)
+        self._size = len(H)
+        self._action = np.array([[action(h, n) for n in N] for h in H], dtype=np.intp)
+        self._action_rows = self._action.tolist()
+
+    def encode(self, a):
+        n, h = a
+        return n * self._size + h
+
+    def decode(self, code):
+        return divmod(int(code), self._size)
+
+    def inv(self, a):
+        n, h = a
+        h = self.H.inv(h)
+        return self._action_rows[h][self.N.inv(n)], h
+
+    def op(self, a, b):
+        n1, h1 = a
+        n2, h2 = b
+        return self.N.op(n1, self._action_rows[h1][n2]), self.H.op(h1, h2)
+
+    def op_many(self, a, b):
+        """Vectorized op on arrays of codes."""
+        n1, h1 = np.divmod(np.asarray(a), self._size)
+        n2, h2 = np.divmod(np.asarray(b), self._size)
+        n = self.N.table[n1, self._action[h1, n2]]
+        return n * self._size + self.H.table[h1, h2]
+
+    def inv_many(self, a):
+        """Vectorized inv on an array of codes."""
+        n, h = np.divmod(np.asarray(a), self._size)
+        h = self.H.inverses[h]
+        return self._action[h, self.N.inverses[n]] * self._size + h
@@ -0,0 +1,180 @@
+"""Compact binary serialization of words and finite group elements.
+
+Words of a free group are written as a varint count of syllables, followed
+by a varint generator index and a zigzag varint exponent per syllable. The
+generator index refers to the order of generators of the free group. A
+stream of words is the concatenation of their serializations.
+
+Elements of finite groups are written as integer codes, as returned by the
+encode method of the group. An array of codes, such as a list of elements or
+a compiled Cayley table, is written as one byte for the item size, one byte
+for the number of dimensions, a varint per dimension, and the codes as
+little-endian unsigned integers.
+
+Readers accept any object that supports the buffer protocol, such as bytes,
+memoryview or mmap, and do not copy it. Arrays of codes are returned as
+read-only NumPy views into the buffer.
+"""
+
+from array import array
+import mmap
+
+import numpy as np
+
+from .free_group import FreeGroupElement
+from .packed_free_group import PackedFreeGroup, PackedWord
+
+
+def write_varint(out, n):
+    """Appends the non-negative integer n to the bytearray out."""
+    assert n >= 0
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(buffer, pos):
+    """Returns (n, pos) for the varint n that starts at pos and ends before the new pos."""
+    n = 0
+    shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _zigzag(n):
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if n % 2 == 0 else -(n >> 1) - 1
+
+
+def _generator_index(G):
+    if isinstance(G, PackedFreeGroup):
+        return G._index
+    return {g: i for i, g in enumerate(G._generators)}
+
+
+def _syllables(index, word):
+    """Returns the (generator index, exponent) pairs of a word."""
+    if isinstance(word, PackedWord):
+        return zip(word._gens[word._start : word._stop], word._exps[word._start : word._stop])
+    return ((index[g], e) for g, e in word.value)
+
+
+def _write_word(out, index, word):
+    syllables = list(_syllables(index, word))
+    write_varint(out, len(syllables))
+    for i, e in syllables:
+        write_varint(out, i)
+        write_varint(out, _zigzag(e))
+
+
+def _read_word(G, buffer, pos):
+    length, pos = read_varint(buffer, pos)
+    syllables = []
+    for _ in range(length):
+        i, pos = read_varint(buffer, pos)
+        e, pos = read_varint(buffer, pos)
+        syllables.append((i, _unzigzag(e)))
+    if isinstance(G, PackedFreeGroup):
+        gens = array("i", [i for i, _ in syllables])
+        exps = array("l", [e for _, e in syllables])
+        return PackedWord(G, gens, exps, 0, length), pos
+    # Exponents of FreeGroupElements are unbounded, so they stay Python ints.
+    names = G._generators
+    return FreeGroupElement([(names[i], e) for i, e in syllables]), pos
+
+
+def dumps_word(G, word):
+    """Returns the serialization of a word of the free group G."""
+    out = bytearray()
+    _write_word(out, _generator_index(G), word)
+    return bytes(out)
+
+
+def loads_word(G, buffer):
+    """Returns the word of the free group G serialized in buffer."""
+    word, _ = _read_word(G, memoryview(buffer), 0)
+    return word
+
+
+def write_words(f, G, words, batch_size=1 << 16):
+    """Writes a stream of words of the free group G to the binary file f."""
+    index = _generator_index(G)
+    out = bytearray()
+    for k, word in enumerate(words, 1):
+        _write_word(out, index, word)
+        if k % batch_size == 0:
+            f.write(out)
+            out.clear()
+    f.write(out)
+
+
+def read_words(G, buffer):
+    """Yields the words of the free group G in a stream serialized in buffer."""
+    buffer = memoryview(buffer).cast("B")
+    pos = 0
+    while pos < len(buffer):
+        word, pos = _read_word(G, buffer, pos)
+        yield word
+
+
+def dumps_codes(codes):
+    """Returns the serialization of an array of non-negative integer codes."""
+    codes = np.asarray(codes)
+    assert codes.ndim < 256
+    top = int(codes.max()) if codes.size else 0
+    assert codes.size == 0 or int(codes.min()) >= 0
+    size = next(size for size in (1, 2, 4, 8) if top < 1 << (8 * size))
+    out = bytearray([size, codes.ndim])
+    for n in codes.shape:
+        write_varint(out, n)
+    out += np.ascontiguousarray(codes, dtype=f"<u{size}").tobytes()
+    return bytes(out)
+
+
+def loads_codes(buffer, pos=0):
+    """Returns (codes, pos) for the array of codes serialized at pos in buffer.
+
+    The array is a read-only view into buffer, and pos is the position
+    after it.
+    """
+    buffer = memoryview(buffer).cast("B")
+    size = buffer[pos]
+    ndim = buffer[pos + 1]
+    pos += 2
+    shape = []
+    for _ in range(ndim):
+        n, pos = read_varint(buffer, pos)
+        shape.append(n)
+    count = int(np.prod(shape))
+    codes = np.frombuffer(buffer, dtype=f"<u{size}", count=count, offset=pos).reshape(shape)
+    return codes, pos + count * size
+
+
+def write_elements(f, G, elements):
+    """Writes elements of the finite group G to the binary file f as codes."""
+    f.write(dumps_codes(np.array([G.encode(a) for a in elements], dtype=np.int64)))
+
+
+def read_elements(G, buffer, pos=0):
+    """Returns (elements, pos) for the elements of the finite group G serialized at pos.
+
+    As for loads_codes, the returned pos is the position after the list, so
+    that consecutive lists can be read one after another.
+    """
+    codes, pos = loads_codes(buffer, pos)
+    return [G.decode(c) for c in codes.tolist()], pos
+
+
+def map_file(path):
+    """Returns a read-only memory map of the file at path, for use as a buffer."""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
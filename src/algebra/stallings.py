@@ -0,0 +1,263 @@
+"""Finitely generated subgroups of free groups, represented by Stallings graphs.
+
+The Stallings graph of a subgroup H is obtained from a bouquet of loops, one
+for each generator of H, by folding together edges with the same label that
+leave the same vertex. The resulting graph is deterministic, and a reduced
+word lies in H if and only if it can be read along a closed path at the base
+vertex.
+
+Edge labels are letters: the generator with index k is the letter 2k and its
+inverse is the letter 2k + 1, so that flipping the lowest bit inverts a
+letter. Edges are stored in a single flat array with one slot per vertex and
+letter, which holds the target vertex or -1 if there is no such edge.
+"""
+
+from array import array
+from collections import deque
+import itertools
+
+from .free_group import FreeGroupElement
+
+
+class FreeSubgroup:
+    """The subgroup of the free group G generated by a list of words.
+
+    Membership tests and coset representatives take time linear in the
+    length of the word, counting each syllable g^e as at most
+    min(|e|, vertices()) letters.
+    """
+
+    def __init__(self, G, words):
+        self.G = G
+        self._generators = G._generators
+        self._letter = {g: 2 * i for i, g in enumerate(self._generators)}
+        self._width = 2 * len(self._generators)
+        self._edges = array("q", [-1] * self._width)
+        self._parent = array("q", [0])
+        for word in words:
+            self._add_loop(self._letters(word))
+        self._compact()
+        self._tree = None
+
+    def __repr__(self):
+        return f"FreeSubgroup({self.G!r}, rank={self.rank()}, index={self.index()})"
+
+    def _runs(self, word):
+        """Returns the syllables of word as (letter, count) pairs."""
+        runs = []
+        syllables = word.value if isinstance(word, FreeGroupElement) else word
+        for g, e in syllables:
+            letter = self._letter[g]
+            if e < 0:
+                letter += 1
+            runs.append((letter, abs(e)))
+        return runs
+
+    def _letters(self, word):
+        letters = []
+        for letter, count in self._runs(word):
+            letters.extend([letter] * count)
+        return letters
+
+    def _word(self, letters, runs=()):
+        """Returns the word spelled by letters followed by (letter, count) runs."""
+        syllables = []
+        for letter, count in itertools.chain(((x, 1) for x in letters), runs):
+            g = self._generators[letter >> 1]
+            e = -count if letter & 1 else count
+            if syllables and syllables[-1][0] == g:
+                syllables[-1] = g, syllables[-1][1] + e
+            else:
+                syllables.append((g, e))
+        return FreeGroupElement(syllables)
+
+    # Folding keeps a union-find forest of vertices. Only the edges of root
+    # vertices are used, and their targets are resolved with _find.
+
+    def _find(self, v):
+        parent = self._parent
+        root = v
+        while parent[root] != root:
+            root = parent[root]
+        while parent[v] != root:
+            parent[v], v = root, parent[v]
+        return root
+
+    def _new_vertex(self):
+        v = len(self._parent)
+        self._parent.append(v)
+        self._edges.extend([-1] * self._width)
+        return v
+
+    def _merge(self, a, b):
+        edges = self._edges
+        width = self._width
+        pending = [(a, b)]
+        while pending:
+            a, b = pending.pop()
+            a = self._find(a)
+            b = self._find(b)
+            if a == b:
+                continue
+            if b < a:
+                a, b = b, a
+            # Keep the smaller vertex as the root, so that the base stays 0.
+            self._parent[b] = a
+            for letter in range(width):
+                y = edges[b * width + letter]
+                if y == -1:
+                    continue
+                x = edges[a * width + letter]
+                if x == -1:
+                    edges[a * width + letter] = y
+                else:
+                    pending.append((x, y))
+
+    def _add_edge(self, u, letter, v):
+        edges = self._edges
+        width = self._width
+        u = self._find(u)
+        v = self._find(v)
+        x = edges[u * width + letter]
+        if x != -1:
+            self._merge(x, v)
+            return
+        y = edges[v * width + (letter ^ 1)]
+        if y != -1:
+            self._merge(y, u)
+            return
+        edges[u * width + letter] = v
+        edges[v * width + (letter ^ 1)] = u
+
+    def _add_loop(self, letters):
+        """Adds a closed path at the base vertex labelled by letters and folds it."""
+        width = self._width
+        v = 0
+        last = len(letters) - 1
+        for i, letter in enumerate(letters):
+            if i == last:
+                self._add_edge(v, letter, 0)
+                break
+            x = self._edges[self._find(v) * width + letter]
+            if x != -1:
+                v = self._find(x)
+                continue
+            target = self._new_vertex()
+            self._add_edge(v, letter, target)
+            v = target
+
+    def _compact(self):
+        """Renumbers root vertices consecutively and resolves all edge targets."""
+        width = self._width
+        roots = [v for v in range(len(self._parent)) if self._parent[v] == v]
+        number = {v: k for k, v in enumerate(roots)}
+        edges = array("q", [-1] * (len(roots) * width))
+        for k, v in enumerate(roots):
+            for letter in range(width):
+                x = self._edges[v * width + letter]
+                if x != -1:
+                    edges[k * width + letter] = number[self._find(x)]
+        self._edges = edges
+        self._vertices = len(roots)
+        del self._parent
+
+    def vertices(self):
+        """Returns the number of vertices of the Stallings graph."""
+        return self._vertices
+
+    def _read(self, runs):
+        """Returns (v, rest) where reading runs from the base ends at v and stops before rest.
+
+        In a folded graph, a path of equal letters that repeats a vertex
+        first returns to its start, so each run of count letters is read in
+        at most one cycle plus count modulo its length steps.
+        """
+        edges = self._edges
+        width = self._width
+        v = 0
+        for k, (letter, count) in enumerate(runs):
+            start = v
+            steps = 0
+            while count > 0:
+                x = edges[v * width + letter]
+                if x == -1:
+                    return v, [(letter, count)] + runs[k + 1 :]
+                v = x
+                count -= 1
+                steps += 1
+                if v == start:
+                    count %= steps
+        return v, []
+
+    def __contains__(self, word):
+        v, rest = self._read(self._runs(word))
+        return v == 0 and not rest
+
+    def rank(self):
+        """Returns the rank of the subgroup, which is free."""
+        edges = sum(x != -1 for x in self._edges) // 2
+        return edges - self._vertices + 1
+
+    def index(self):
+        """Returns the index in G, which is finite iff the Stallings graph is complete."""
+        if -1 in self._edges:
+            return float("inf")
+        return self._vertices
+
+    def _spanning_tree(self):
+        """Returns the (parent, letter) arrays of a breadth-first spanning tree."""
+        if self._tree is None:
+            edges = self._edges
+            width = self._width
+            parent = array("q", [-1] * self._vertices)
+            letters = array("q", [-1] * self._vertices)
+            parent[0] = 0
+            queue = deque([0])
+            while queue:
+                v = queue.popleft()
+                for letter in range(width):
+                    x = edges[v * width + letter]
+                    if x != -1 and parent[x] == -1:
+                        parent[x] = v
+                        letters[x] = letter
+                        queue.append(x)
+            self._tree = parent, letters
+        return self._tree
+
+    def _path(self, v):
+        """Returns the letters of the path in the spanning tree from the base to v."""
+        parent, letters = self._spanning_tree()
+        path = []
+        while v != 0:
+            path.append(letters[v])
+            v = parent[v]
+        path.reverse()
+        return path
+
+    def coset_representative(self, word):
+        """Returns a canonical representative of the right coset H word.
+
+        Two words lie in the same right coset iff their representatives are
+        equal.
+        """
+        v, rest = self._read(self._runs(word))
+        return self._word(self._path(v), rest)
+
+    def basis(self):
+        """Returns a free basis of the subgroup, one word per edge not in the spanning tree."""
+        parent, tree_letters = self._spanning_tree()
+        edges = self._edges
+        width = self._width
+        basis = []
+        for u in range(self._vertices):
+            for letter in range(0, width, 2):
+                v = edges[u * width + letter]
+                if v == -1:
+                    continue
+                if parent[v] == u and tree_letters[v] == letter and v != 0:
+                    continue
+                if parent[u] == v and tree_letters[u] == letter ^ 1 and u != 0:
+                    continue
+                inverse_path = [x ^ 1 for x in reversed(self._path(v))]
+                basis.append(self._word(self._path(u) + [letter] + inverse_path))
+        return basis
@@ -3,33 +3,248 @@ Morgan Ward (1930). "Postulates for the inverse operations in a group."
 Transactions of the American Mathematical Society, 32 (3): 520–526.
 """
 
+import numpy as np
+
+from . import assertion, memo
+from .cayley import CayleyTable
+
 
 class WardQuasigroup:
+    """The quasigroup of the set S under the division div.
+
+    If memoize is True or a maximum cache size, div is memoized, and an
+    unbounded cache becomes a dense table once every quotient is known.
+    """
 
-    def __init__(self, S, div):
+    def __init__(self, S, div, *, memoize=False):
         self.S = S
-        self._div = div
+        self._div = memo.memoize(div, memoize, elements=S)
+        self._right_identity = None
+        self._tables = None
+
+    @classmethod
+    def from_table(cls, table, S=None):
+        """Returns the precomputed quasigroup with S[a] / S[b] == S[table[a][b]].
+
+        S defaults to range(len(table)). Raises ValueError describing the
+        first failure if table is not the division table of a group.
+        """
+        div = np.asarray(table)
+        if S is not None:
+            S = list(S)
+        problem = check_division_table(div, S)
+        if problem is not None:
+            raise ValueError(problem)
+        return cls._from_division_table(div, S)
+
+    @classmethod
+    def from_group(cls, G):
+        """Returns the precomputed quasigroup of G with a / b == a b⁻¹.
+
+        G is any finite group with __iter__, op, inv and identity, such as
+        DihedralGroup or a Multiplicative wrapper, or a CayleyTable.
+        """
+        if isinstance(G, CayleyTable):
+            T = G
+            S = None
+        else:
+            T = CayleyTable(G)
+            S = [T.decode(a) for a in T]
+        return cls._from_division_table(T.table[:, T.inverses], S)
+
+    @classmethod
+    def _from_division_table(cls, div, S=None):
+        rows = div.tolist()
+        if S is None:
+            Q = cls(list(range(len(rows))), lambda a, b: rows[a][b])
+        else:
+            index = {a: k for k, a in enumerate(S)}
+            Q = cls(S, lambda a, b: S[rows[index[a]][index[b]]])
+        Q._tables = _WardTables(Q, div)
+        Q._right_identity = Q._tables.elements[Q._tables.identity]
+        return Q
 
     def __len__(self):
         return len(self.S)
 
     def __iter__(self):
+        if self._tables is not None:
+            yield from self._tables.elements
+            return
         for a in self.S:
-            yield WardQuasigroupElement(self._div, a)
+            yield WardQuasigroupElement(self._div, a, self)
 
     def __contains__(self, element):
         return isinstance(element, WardQuasigroupElement) and element.value in self.S
 
     def right_identity(self):
-        a = next(iter(self))
-        return a / a
+        if self._right_identity is None:
+            a = next(iter(self))
+            self._right_identity = a / a
+        return self._right_identity
+
+    def inverse(self, a):
+        """Returns i / a, the inverse of a in the derived group."""
+        return self.right_identity() / a
+
+    def precompute(self):
+        """Tabulates division and the derived operations ▱ and ∆.
+
+        Afterwards, elements of this quasigroup are unique objects and /, *
+        and ^ between them are table lookups. Returns self.
+        """
+        if self._tables is None:
+            self._tables = _WardTables(self)
+            self._right_identity = self._tables.elements[self._tables.identity]
+        return self
+
+    def group(self):
+        """Returns the group (S, ▱) derived from this quasigroup."""
+        return WardGroup(self)
+
+
+class WardGroup:
+    """The group derived from a Ward quasigroup via Definition 2.
+
+    Elements are the raw values of the quasigroup, the operation is
+    x ▱ y = y / (i / x), the identity is i = x / x, and the inverse of x is
+    i / x.
+    """
+
+    def __init__(self, Q):
+        self.Q = Q
+        self._div = Q._div
+        a = next(iter(Q.S))
+        self._i = self._div(a, a)
+
+    def __repr__(self):
+        return f"WardGroup({self.Q.S!r})"
+
+    def __iter__(self):
+        return iter(self.Q.S)
+
+    def order(self):
+        return len(self.Q.S)
+
+    def identity(self):
+        return self._i
+
+    def inv(self, a):
+        return self._div(self._i, a)
+
+    def op(self, a, b):
+        return self._div(b, self._div(self._i, a))
+
+
+def check_division_table(table, S=None):
+    """Returns None if table is the division table of a group, else a description of a failure.
+
+    The table is checked to be a Latin square with a unique idempotent, which
+    is the right identity i. Postulate 3 is checked through the derived group,
+    which must have identity i, inverses a ↦ i / a, and be associative, as
+    verified by Light's test. Only if that fails is Postulate 3 checked
+    exhaustively, to find a counterexample.
+    """
+    div = np.asarray(table)
+    n = len(div)
+    if n == 0 or div.shape != (n, n):
+        return f"division table must be square and non-empty, not of shape {div.shape}"
+    if div.dtype.kind not in "iu":
+        return f"division table must have integer entries, not {div.dtype}"
+    name = (lambda k: int(k)) if S is None else (lambda k: S[k])
+    bad = (div < 0) | (div >= n)
+    if bad.any():
+        a, b = np.argwhere(bad)[0]
+        return f"{name(a)} / {name(b)} == {div[a, b]} is not an element"
+    identity = np.arange(n)
+    for rows, fmt in ((div, "{a} / {b} == {a} / {c}"), (div.T, "{b} / {a} == {c} / {a}")):
+        bad = (np.sort(rows, axis=1) != identity).any(axis=1)
+        if bad.any():
+            a = np.flatnonzero(bad)[0]
+            first = np.full(n, -1)
+            for c, x in enumerate(rows[a].tolist()):
+                if first[x] >= 0:
+                    d = fmt.format(a=name(a), b=name(first[x]), c=name(c))
+                    return f"{d} == {name(x)} but {name(first[x])} != {name(c)}"
+                first[x] = c
+    diagonal = np.diagonal(div)
+    (idempotents,) = np.nonzero(diagonal == identity)
+    if len(idempotents) != 1:
+        if len(idempotents) == 0:
+            return "there is no a with a / a == a"
+        a, b = idempotents[:2]
+        return f"{name(a)} / {name(a)} == {name(a)} and {name(b)} / {name(b)} == {name(b)}"
+    (i,) = idempotents
+    bad = diagonal != i
+    if bad.any():
+        a = np.flatnonzero(bad)[0]
+        x, i = name(diagonal[a]), name(i)
+        return f"{name(a)} / {name(a)} == {x} != {i} == {i} / {i}"
+    if not _derived_group_holds(div, i):
+        return _postulate_3_counterexample(div, i, name)
+    return None
+
+
+def _derived_group_holds(div, i):
+    inverses = div[i]
+    if (inverses[inverses] != np.arange(len(div))).any():
+        return False
+    # x ▱ y == y / (i / x)
+    mul = div[:, inverses].T
+    try:
+        assertion.table_is_identity(i, mul)
+        assertion.table_has_inverses(i, inverses, mul)
+        assertion.table_is_associative_light(mul)
+    except AssertionError:
+        return False
+    return True
+
+
+def _postulate_3_counterexample(div, i, name):
+    inverses = div[i]
+    # rhs[b, c] == c / (i / b)
+    rhs = div[:, inverses].T
+    for start, stop in assertion.blocks(len(div)):
+        rows = div[start:stop]
+        bad = div[rows] != rows[:, rhs]
+        if bad.any():
+            a, b, c = np.argwhere(bad)[0]
+            a += start
+            x, y = div[div[a, b], c], div[a, rhs[b, c]]
+            a, b, c = name(a), name(b), name(c)
+            i = name(i)
+            return f"({a} / {b}) / {c} == {name(x)} != {name(y)} == {a} / ({c} / ({i} / {b}))"
+    raise AssertionError("the derived group is not a group, but Postulate 3 holds")
+
+
+class _WardTables:
+    """Division and derived operation tables of a WardQuasigroup, over element indices."""
+
+    def __init__(self, Q, div=None):
+        if div is None:
+            values, div = assertion.tabulate(Q._div, Q.S)
+        else:
+            values = list(Q.S)
+        self.elements = [WardQuasigroupElement(Q._div, a, Q, k) for k, a in enumerate(values)]
+        self.identity = int(div[0, 0])
+        self.inverses = div[self.identity]
+        # x ▱ y == y / (i / x)
+        self.mul = div[:, self.inverses].T
+        # x ∆ y == (i / x) / (i / y)
+        self.xor = div[self.inverses[:, None], self.inverses[None, :]]
+        self.div = div
+        self._div = div.tolist()
+        self._mul = self.mul.tolist()
+        self._xor = self.xor.tolist()
 
 
 class WardQuasigroupElement:
 
-    def __init__(self, div, value):
+    def __init__(self, div, value, Q=None, index=None):
         self.div = div
         self.value = value
+        self.Q = Q
+        self.index = index
 
     def __repr__(self):
         return str(self.value)
@@ -44,15 +259,30 @@ class WardQuasigroupElement:
         return not (self == other)
 
     def _wrap(self, value):
-        return WardQuasigroupElement(self.div, value)
+        return WardQuasigroupElement(self.div, value, self.Q)
+
+    def _tables(self, other):
+        """Returns the tables of the quasigroup of both elements, if precomputed."""
+        if self.index is not None and other.index is not None and self.Q is other.Q:
+            return self.Q._tables
+        return None
 
     def __truediv__(self, other):
+        T = self._tables(other)
+        if T is not None:
+            return T.elements[T._div[self.index][other.index]]
         return self._wrap(self.div(self.value, other.value))
 
     def __mul__(self, other):
+        T = self._tables(other)
+        if T is not None:
+            return T.elements[T._mul[self.index][other.index]]
         i = self / self
         return other / (i / self)
 
     def __xor__(self, other):
+        T = self._tables(other)
+        if T is not None:
+            return T.elements[T._xor[self.index][other.index]]
         i = self / self
         return (i / self) / (i / other)
@@ -0,0 +1,198 @@
+import re
+
+import numpy as np
+import pytest
+
+from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import DihedralGroup
+
+
+def test_tabulate():
+    elements, table = assertion.tabulate(lambda a, b: (a + b) % 4, range(4))
+    assert elements == [0, 1, 2, 3]
+    assert table.tolist() == [[(a + b) % 4 for b in range(4)] for a in range(4)]
+    with pytest.raises(AssertionError, match=r"f\(1, 3\) == 4 is not an element"):
+        assertion.tabulate(lambda a, b: a + b, range(4))
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 20])
+def test_dihedral_group(n):
+    T = CayleyTable(DihedralGroup(n))
+    assertion.table_is_associative(T.table)
+    assertion.table_is_identity(T.identity(), T.table)
+    assertion.table_has_inverses(T.identity(), T.inverses, T.table)
+    if n <= 2:
+        assertion.table_is_commutative(T.table)
+    else:
+        with pytest.raises(AssertionError):
+            assertion.table_is_commutative(T.table)
+
+
+def test_same_messages():
+    # Subtraction modulo 3 is neither associative nor commutative.
+    def f(a, b):
+        return (a - b) % 3
+
+    elements, table = assertion.tabulate(f, range(3))
+    for check, table_check in [
+        (assertion.is_associative, assertion.table_is_associative),
+        (assertion.is_commutative, assertion.table_is_commutative),
+    ]:
+        with pytest.raises(AssertionError) as expected:
+            check(f, elements)
+        with pytest.raises(AssertionError) as actual:
+            table_check(table, elements)
+        assert str(actual.value) == str(expected.value)
+    with pytest.raises(AssertionError) as expected:
+        assertion.is_left_identity(0, f, elements)
+    with pytest.raises(AssertionError) as actual:
+        assertion.table_is_left_identity(0, table, elements)
+    assert str(actual.value) == str(expected.value)
+    assertion.table_is_right_identity(0, table, elements)
+
+
+def test_distributivity():
+    n = 6
+    elements = list(range(n))
+    _, add = assertion.tabulate(lambda a, b: (a + b) % n, elements)
+    _, mul = assertion.tabulate(lambda a, b: (a * b) % n, elements)
+    assertion.table_distributes_over(mul, add, elements)
+    message = r"^f\(1, g\(0, 1\)\) == 1 != 2 == g\(f\(1, 0\), f\(1, 1\)\)$"
+    with pytest.raises(AssertionError, match=message):
+        assertion.table_left_distributes_over(add, mul, elements)
+    message = r"^f\(g\(0, 0\), 2\) == 2 != 4 == g\(f\(0, 2\), f\(0, 2\)\)$"
+    with pytest.raises(AssertionError, match=message):
+        assertion.table_right_distributes_over(add, mul, elements)
+
+
+def test_inverses_failure():
+    table = np.array([[0, 1], [1, 1]])
+    with pytest.raises(AssertionError, match=r"^f\(1, 1\) == 1 != 0$"):
+        assertion.table_has_inverses(0, [0, 1], table)
+
+
+@pytest.mark.parametrize("n", [1, 3, 8])
+def test_probably_associative(n):
+    T = CayleyTable(DihedralGroup(n))
+    rounds = assertion.table_is_probably_associative(T.table, seed=0)
+    assert rounds == assertion.table_is_probably_associative(T.table, confidence=1 - 1e-12)
+    assert rounds >= 1
+    assert assertion.is_probably_associative(T.op, T, confidence=0.99, seed=1) >= 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_probably_associative_counterexample(seed):
+    T = CayleyTable(DihedralGroup(7))
+    table = T.table.copy()
+    table[3, 11] = table[3, 12]
+    with pytest.raises(AssertionError) as excinfo:
+        assertion.table_is_probably_associative(table, seed=seed)
+    match = re.match(r"f\(f\((\d+), (\d+)\), (\d+)\)", str(excinfo.value))
+    a, b, c = (int(x) for x in match.groups())
+    assert table[table[a, b], c] != table[a, table[b, c]]
+
+
+def ward_table(n):
+    # a / b == a - b in the cyclic group of order n.
+    return [[(a - b) % n for b in range(n)] for a in range(n)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 12])
+def test_probably_ward(n):
+    assert assertion.table_is_probably_ward(ward_table(n), seed=0) >= 1
+    T = CayleyTable(DihedralGroup(n))
+    div = T.table[:, T.inverses]
+    assert assertion.table_is_probably_ward(div, seed=0) >= 1
+    assert assertion.is_probably_ward(lambda a, b: (a - b) % n, range(n), seed=0) >= 1
+
+
+def test_probably_ward_failures():
+    with pytest.raises(AssertionError, match=r"^0 / 1 == 4 is not an element$"):
+        assertion.table_is_probably_ward([[0, 4], [1, 0]])
+    with pytest.raises(AssertionError, match=r"^1 / 1 == 1 != 0 == 0 / 0$"):
+        assertion.table_is_probably_ward([[0, 1], [1, 1]])
+    with pytest.raises(AssertionError, match=r"^0 / 0 == 0 == 0 / 1 but 0 != 1$"):
+        assertion.table_is_probably_ward([[0, 0], [1, 0]])
+    # a / b == b - a satisfies Postulates 1, 2 and 4, but not Postulate 3.
+    div = [[(b - a) % 5 for b in range(5)] for a in range(5)]
+    message = r"^\(\d / \d\) / \d == \d != \d == \d / \(\d / \(0 / \d\)\)$"
+    with pytest.raises(AssertionError, match=message):
+        assertion.table_is_probably_ward(div, seed=0)
+
+
+@pytest.mark.parametrize("n", [1, 2, 6, 15])
+def test_generating_set(n):
+    G = DihedralGroup(n)
+    gens = assertion.generating_set(G.op, G)
+    assert len(gens) <= 3
+    generators = [(True, 1), (False, 0)]
+    assert assertion.generating_set(G.op, G, generators) == generators
+    T = CayleyTable(G)
+    assert [T.decode(a) for a in assertion.table_generating_set(T.table)] == gens
+    with pytest.raises(AssertionError, match="not closed"):
+        assertion.generating_set(lambda a, b: a + b, range(3))
+
+
+@pytest.mark.parametrize("n", [1, 2, 6, 15])
+def test_associative_light(n):
+    G = DihedralGroup(n)
+    assertion.is_associative_light(G.op, G)
+    assertion.is_associative_light(G.op, G, [(True, 1), (False, 0)])
+    T = CayleyTable(G)
+    assertion.table_is_associative_light(T.table)
+    assertion.table_is_associative_light(T.table, generators=[1, n])
+
+
+def test_associative_light_counterexample():
+    def f(a, b):
+        return (a - b) % 4
+
+    elements, table = assertion.tabulate(f, range(4))
+    with pytest.raises(AssertionError) as expected:
+        assertion.is_associative_light(f, elements)
+    with pytest.raises(AssertionError) as actual:
+        assertion.table_is_associative_light(table, elements)
+    assert str(actual.value) == str(expected.value)
+    # Not closed, so this falls back to the exhaustive test.
+    assertion.is_associative_light(lambda a, b: a + b, range(4))
+
+
+def subtract_mod_7(a, b):
+    return (a - b) % 7
+
+
+def add_mod_7(a, b):
+    return (a + b) % 7
+
+
+def multiply_mod_7(a, b):
+    return a * b % 7
+
+
+def almost_add_mod_7(a, b):
+    return 1 if (a, b) == (5, 0) else (a + b) % 7
+
+
+def message(check, *args, **kwargs):
+    with pytest.raises(AssertionError) as e:
+        check(*args, **kwargs)
+    return str(e.value)
+
+
+def test_parallel():
+    G = DihedralGroup(4)
+    assertion.is_associative(G.op, G, workers=2)
+    assertion.distributes_over(multiply_mod_7, add_mod_7, range(7), workers=2)
+    sequential = message(assertion.is_associative, subtract_mod_7, range(7))
+    for _ in range(3):
+        parallel = message(assertion.is_associative, subtract_mod_7, range(7), workers=3)
+        assert parallel == sequential
+    sequential = message(assertion.is_associative, almost_add_mod_7, range(7))
+    assert sequential.startswith("f(f(1, 4), 0)")
+    parallel = message(assertion.is_associative, almost_add_mod_7, range(7), workers=4)
+    assert parallel == sequential
+    with pytest.raises(AssertionError):
+        assertion.left_distributes_over(add_mod_7, multiply_mod_7, range(7), workers=2)
+    with pytest.raises(AssertionError):
+        assertion.right_distributes_over(add_mod_7, multiply_mod_7, range(7), workers=2)
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from algebra import benchmark
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", sorted(benchmark.BENCHMARKS))
+def test_benchmark(name):
+    for param in benchmark.SIZES["quick"][name]:
+        seconds, peak = benchmark.measure(benchmark.BENCHMARKS[name](param), min_time=0.01)
+        assert seconds > 0
+        assert peak >= 0
+
+
+@pytest.mark.benchmark
+def test_main(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    argv = ["--only", "dihedral_op", "crt", "--min-time", "0.01", "--output", str(output)]
+    assert benchmark.main(argv) == 0
+    results = benchmark.load(output)
+    assert sorted(results) == ["crt[16]", "crt[64]", "dihedral_op[1000]", "dihedral_op[10]"]
+    assert json.loads(output.read_text())["python"]
+    assert benchmark.main(argv + ["--baseline", str(output), "--threshold", "1000"]) == 0
+    assert "x\n" in capsys.readouterr().out
+
+
+def test_compare():
+    baseline = {
+        "a[1]": {"seconds": 1.0, "peak_bytes": 100},
+        "b[1]": {"seconds": 1.0, "peak_bytes": 100},
+        "c[1]": {"seconds": 1.0, "peak_bytes": 100},
+    }
+    results = {
+        "a[1]": {"seconds": 1.2, "peak_bytes": 100},
+        "b[1]": {"seconds": 0.5, "peak_bytes": 200},
+        "d[1]": {"seconds": 9.0, "peak_bytes": 900},
+    }
+    regressions = benchmark.compare(results, baseline, threshold=0.25)
+    assert regressions == [("b[1]", "peak_bytes", 100, 200)]
+    assert benchmark.compare(results, baseline, threshold=0.1) == [
+        ("a[1]", "seconds", 1.0, 1.2),
+        ("b[1]", "peak_bytes", 100, 200),
+    ]
@@ -0,0 +1,185 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import D, DihedralGroup
+from algebra.modular_group import Units
+from algebra.overload import Multiplicative
+from algebra.ward_quasigroup import WardQuasigroup
+
+GROUPS = [DihedralGroup(n) for n in (1, 2, 3, 6, 10)] + [D(4)]
+
+
+@pytest.mark.parametrize("G", GROUPS)
+def test_op(G):
+    T = CayleyTable(G)
+    assert T.order() == len(T) == G.order()
+    for a, b in itertools.product(T, repeat=2):
+        assert T.decode(T.op(a, b)) == G.op(T.decode(a), T.decode(b))
+        assert T.table[a, b] == T.op(a, b)
+
+
+@pytest.mark.parametrize("G", GROUPS)
+def test_identity_and_inverse(G):
+    T = CayleyTable(G)
+    e = T.identity()
+    assert T.decode(e) == G.identity()
+    assertion.is_identity(e, T.op, T)
+    assertion.has_inverses(e, T.op, T.inv, T)
+    for a in T:
+        assert T.inverses[a] == T.inv(a)
+        assert T.encode(T.decode(a)) == a
+
+
+@pytest.mark.parametrize("G", GROUPS)
+def test_associativity(G):
+    T = CayleyTable(G)
+    assertion.is_associative(T.op, T)
+    assertion.table_is_associative_light(T.table, generators=T.generators())
+
+
+@pytest.mark.parametrize("G", GROUPS)
+def test_powers(G):
+    T = CayleyTable(G)
+    for a in T:
+        powers = T.powers(a)
+        assert powers[0] == T.identity()
+        assert len(set(powers)) == len(powers) == T.element_order(a)
+        assert T.op(a, powers[-1]) == T.identity()
+        for k in (-7, -1, 0, 1, 5, 2**100 + 3):
+            assert T.rep(a, k) == T.rep_many(a, k)
+            assert T.decode(T.rep(a, k)) == G.rep(T.decode(a), k)
+    with pytest.raises(ValueError, match=r"^cannot handle exponent 0.5$"):
+        T.rep(0, 0.5)
+
+
+def test_multiplicative():
+    G = Multiplicative(CayleyTable(DihedralGroup(5)))
+    e = G.one()
+    for a in G:
+        assert a * a.inv() == e
+        assert a**10 == e
+    assert [repr(a) for a in G] == [repr(a) for a in D(5)]
+
+
+def test_ward_group():
+    div = [
+        [1, 0, 2],
+        [2, 1, 0],
+        [0, 2, 1],
+    ]
+    W = WardQuasigroup([0, 1, 2], lambda a, b: div[a][b])
+    H = W.group()
+    T = CayleyTable(H)
+    assert T.decode(T.identity()) == W.right_identity().value
+    assertion.is_associative(T.op, T)
+    assertion.has_inverses(T.identity(), T.op, T.inv, T)
+    for a, b in itertools.product(T, repeat=2):
+        x, y = T.decode(a), T.decode(b)
+        assert T.decode(T.op(a, b)) == div[y][div[1][x]]
+
+
+@pytest.mark.parametrize("G", GROUPS)
+def test_batch(G):
+    T = CayleyTable(G)
+    a = np.arange(len(T))
+    assert (T.op_many(a[:, None], a[None, :]) == T.table).all()
+    assert (T.inv_many(a) == T.inverses).all()
+    for k in (-5, -1, 0, 1, 2, 3, 10):
+        assert T.rep_many(a, k).tolist() == [slow_power(T, x, k) for x in a.tolist()]
+    exponents = a - 3
+    assert T.rep_many(a, exponents).tolist() == [
+        slow_power(T, x, k) for x, k in zip(a.tolist(), exponents.tolist())
+    ]
+
+
+def slow_power(T, a, k):
+    result = T.identity()
+    for _ in range(abs(k)):
+        result = T.op(result, a)
+    return T.inv(result) if k < 0 else result
+
+
+def brute_subgroup(T, generators):
+    H = {T.identity()}
+    while True:
+        larger = H | {T.op(a, g) for a in H for g in generators}
+        if larger == H:
+            return H
+        H = larger
+
+
+def test_subgroups():
+    T = CayleyTable(DihedralGroup(12))
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        generators = rng.integers(len(T), size=rng.integers(0, 3)).tolist()
+        H = T.subgroup(generators)
+        assert set(T.members(H).tolist()) == brute_subgroup(T, generators)
+        assert T.subgroup(generators[::-1]) == H
+    r, s = T.encode((True, 1)), T.encode((False, 0))
+    assert T.subgroup([r, s]) == (1 << 24) - 1
+    assert len(T.members(T.subgroup([T.op(r, r)]))) == 6
+    assert T.bitset(range(24)) in T.subgroups()
+
+
+def test_cosets():
+    T = CayleyTable(DihedralGroup(6))
+    r, s = T.encode((True, 1)), T.encode((False, 0))
+    for H in (T.subgroup([s]), T.subgroup([r]), T.subgroup([T.op(r, r), s])):
+        k = len(T.members(H))
+        for side in ("left", "right"):
+            cosets = T.cosets(H, side)
+            assert len(cosets) == len(T) // k
+            assert sum(cosets) == (1 << len(T)) - 1
+            assert cosets[0] == H
+            for C in cosets:
+                a = T.members(C)[0]
+                expected = {T.op(a, h) if side == "left" else T.op(h, a) for h in T.members(H)}
+                assert set(T.members(C).tolist()) == expected
+    H = T.subgroup([s])
+    assert T.cosets(H, "left") != T.cosets(H, "right")
+
+
+def test_normal_closure_and_orbit():
+    T = CayleyTable(DihedralGroup(6))
+    r, s = T.encode((True, 1)), T.encode((False, 0))
+    # The reflections s₀, s₂, s₄ are conjugate, and generate D₃ with r².
+    N = T.normal_closure([s])
+    assert set(T.members(N).tolist()) == brute_subgroup(T, [s, T.op(r, r)])
+    assert T.orbit(s) == T.bitset(T.encode((False, i)) for i in (0, 2, 4))
+    assert T.orbit(r) == T.bitset([r, T.inv(r)])
+    for H in (T.subgroup([r]), N):
+        assert T.normal_closure(T.members(H)) == H
+    assert T.normal_closure([]) == 1 << T.identity()
+    # Orbit of the identity under left multiplication by a subgroup is the subgroup.
+    H = T.subgroup([T.op(r, r), s])
+    assert T.orbit(T.identity(), T.members(H), lambda x, g: T.table[g, x]) == H
+
+
+@pytest.mark.parametrize("G", [DihedralGroup(6), D(6), DihedralGroup(7), Units(20), D(1)])
+def test_conjugacy(G):
+    T = CayleyTable(G)
+    classes = T.conjugacy_classes()
+    assert sum(classes) == (1 << len(T)) - 1
+    for C in classes:
+        a = T.members(C)[0]
+        expected = {T.op(T.op(T.inv(g), a), g) for g in T}
+        assert set(T.members(C).tolist()) == expected
+    for a in T:
+        expected = {g for g in T if T.op(a, g) == T.op(g, a)}
+        assert set(T.members(T.centralizer(a)).tolist()) == expected
+    center = [a for a in T if len(T.members(T.centralizer(a))) == len(T)]
+    assert T.center() == T.bitset(center)
+    central, sizes = T.class_equation()
+    assert central == len(center)
+    assert central + sum(sizes) == len(T)
+    assert T.conjugacy_classes() is classes
+
+
+def test_class_equation():
+    assert CayleyTable(D(6)).class_equation() == (2, [2, 2, 3, 3])
+    assert CayleyTable(DihedralGroup(5)).class_equation() == (1, [2, 2, 5])
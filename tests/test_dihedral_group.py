@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from algebra import assertion
-from algebra.dihedral_group import D
+from algebra.dihedral_group import D, DihedralGroup
 
 DIHEDRAL_GROUPS = [D(n) for n in range(1, 21)]
 
@@ -11,6 +12,13 @@ def test_associativity(G):
     assertion.is_associative(G.op, G)
 
 
+@pytest.mark.parametrize("G", DIHEDRAL_GROUPS)
+def test_generators(G):
+    gens = list(G.generators())
+    assert assertion.generating_set(G.op, G, gens) == gens
+    assertion.is_associative_light(G.op, G, gens)
+
+
 @pytest.mark.parametrize("G", DIHEDRAL_GROUPS)
 def test_identity(G):
     assertion.is_identity(G.identity(), G.op, G)
@@ -52,3 +60,51 @@ def test_root(G):
         for a in G:
             assert (a ** (1 / k)) ** k == a
             assert (a**k) ** (1 / k) == a
+
+
+@pytest.mark.parametrize("G", DIHEDRAL_GROUPS)
+def test_batch(G):
+    elements = list(G)
+    codes = G.encode_many(elements)
+    assert codes.tolist() == list(range(G.order()))
+    assert G.decode_many(codes) == elements
+    a, b = np.meshgrid(codes, codes, indexing="ij")
+    products = G.op_many(a.ravel(), b.ravel())
+    assert G.decode_many(products) == [x * y for x in elements for y in elements]
+    assert G.decode_many(G.inv_many(codes)) == [x.inv() for x in elements]
+    for k in (-3, 0, 1, 2, 7, 2**100 + 1):
+        assert G.decode_many(G.rep_many(codes, k)) == [x**k for x in elements]
+    exponents = np.arange(len(codes)) - 5
+    assert G.decode_many(G.rep_many(codes, exponents)) == [
+        x**k for x, k in zip(elements, exponents.tolist())
+    ]
+
+
+@pytest.mark.parametrize("G", DIHEDRAL_GROUPS)
+def test_element_order(G):
+    e = G.one()
+    for a in G:
+        k = a.order()
+        assert G.order() % k == 0
+        assert a**k == e
+        assert all(a**j != e for j in range(1, k))
+        assert a ** (k * 2**200 + 1) == a
+        assert a ** -(k * 2**200 + 1) == a.inv()
+
+
+@pytest.mark.parametrize("n", range(1, 13))
+def test_conjugacy(n):
+    G = DihedralGroup(n)
+    elements = list(G)
+    classes = G.conjugacy_classes()
+    assert sorted(x for C in classes for x in C) == sorted(elements)
+    for C in classes:
+        a = C[0]
+        assert set(C) == {G.op(G.op(G.inv(g), a), g) for g in elements}
+    for a in elements:
+        assert set(G.centralizer(a)) == {g for g in elements if G.op(a, g) == G.op(g, a)}
+    center = {a for a in elements if len(G.centralizer(a)) == G.order()}
+    assert set(G.center()) == center
+    central, sizes = G.class_equation()
+    assert central == len(center)
+    assert central + sum(sizes) == G.order()
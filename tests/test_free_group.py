@@ -1,10 +1,10 @@
 from functools import reduce
-from itertools import permutations
+from itertools import permutations, product
 
 import pytest
 
 from algebra import assertion
-from algebra.free_group import FreeGroup
+from algebra.free_group import FreeGroup, FreeGroupElement
 
 
 FREE_GROUPS = [
@@ -61,3 +61,77 @@ def test_power(G):
             assert ak * a**-k == e
             assert a**-k * ak == e
             ak = ak * a
+
+
+@pytest.mark.parametrize("G", FREE_GROUPS)
+def test_power_agrees_with_repeated_product(G):
+    e = G.one()
+    for a in gen_elements(G):
+        b = a * a.inv().inv() * a
+        for w in (a, b, G.op(b, a.inv())):
+            ak = e
+            for k in range(6):
+                assert w**k == ak
+                assert w**-k == ak.inv()
+                ak = ak * w
+
+
+def test_power_conjugate():
+    G = FreeGroup(["a", "b", "c"])
+    a, b, c = G.generators()
+    for w in (
+        a * b * a.inv(),
+        a**2 * b * a,
+        a**2 * b * a**-1,
+        c * a * b * c * a**-1 * c.inv(),
+        b * a * b * a * b,
+    ):
+        p = w.lazy_pow(7)
+        expected = e = G.identity()
+        for _ in range(7):
+            expected = expected * w
+        assert p.expand() == expected
+        assert p == expected
+        assert expected == p
+        assert len(p) == len(expected.value)
+        assert hash(p) == hash(expected)
+        assert p.inv() == expected.inv()
+        assert p**-2 == expected.inv() * expected.inv()
+        assert w.lazy_pow(0) == e
+        assert w.lazy_pow(-7) == p.inv()
+
+
+def test_lazy_power():
+    G = FreeGroup(["a", "b"])
+    a, b = G.generators()
+    w = b * a * b * a**2 * b.inv()
+    p = w.lazy_pow(10**9)
+    assert repr(p) == "b a (b a³)¹⁰⁰⁰⁰⁰⁰⁰⁰⁰ a⁻¹ b⁻¹"
+    assert len(p) == 2 * 10**9 + 3
+    assert p == w.lazy_pow(10**9)
+    assert p != w.lazy_pow(10**9 - 1)
+    w = (a * b * a.inv()).lazy_pow(10**9)
+    assert w.expand().value == [("a", 1), ("b", 10**9), ("a", -1)]
+
+
+@pytest.mark.parametrize("G", FREE_GROUPS)
+def test_incremental_hash(G):
+    words = list(gen_elements(G))
+    for a in words:
+        hash(a)
+    for a, b in product(words, repeat=2):
+        c = a * b
+        assert c is a or c is b or c._hash is not None
+        assert hash(c) == hash(FreeGroupElement(list(c.value)))
+        assert hash(c.inv()) == hash(FreeGroupElement(list(c.inv().value)))
+        assert hash(c.inv().inv()) == hash(c)
+
+
+def test_interning():
+    G = FreeGroup(["a", "b"], intern=True)
+    a, b = G.generators()
+    assert G.op(a, b) is G.op(a, b)
+    assert G.op(G.op(a, b), G.inv(b)) is a
+    assert G.rep(a, 3) is G.op(a, G.op(a, a))
+    assert G.identity() is G.op(a, G.inv(a))
+    assert FreeGroup(["a"]).op(a, b) is not FreeGroup(["a"]).op(a, b)
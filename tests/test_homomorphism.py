@@ -0,0 +1,124 @@
+import random
+
+import numpy as np
+
+from algebra import homomorphism
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import D, DihedralGroup
+from algebra.free_group import FreeGroup, FreeGroupElement
+from algebra.homomorphism import Homomorphism
+from algebra.modular_group import Units
+from algebra.overload import Multiplicative
+from algebra.packed_free_group import PackedFreeGroup
+
+F = FreeGroup("ab")
+
+
+def random_words(rng, count, length):
+    words = []
+    for _ in range(count):
+        word = F.identity()
+        for _ in range(rng.randrange(length)):
+            e = rng.choice([-3, -1, 1, 2, 10**20])
+            word = word * FreeGroupElement([(rng.choice("ab"), e)])
+        words.append(word)
+    return words
+
+
+def fold(G, images, word):
+    """Evaluates word by multiplying one letter at a time."""
+    a = G.identity()
+    for g, e in word.value:
+        x = images[g] if e > 0 else G.inv(images[g])
+        for _ in range(abs(e) % G.order() if e > 0 else -e % G.order()):
+            a = G.op(a, x)
+    return a
+
+
+def test_evaluate():
+    G = DihedralGroup(7)
+    images = {"a": (True, 1), "b": (False, 0)}
+    f = Homomorphism(F, G, images)
+    rng = random.Random(1)
+    for word in random_words(rng, 100, 6):
+        assert f(word) == fold(G, images, word)
+    a, b = F.generators()
+    assert f(a**7) == G.identity()
+    assert f(b * a * b.inv() * a) == G.identity()
+    assert f(F.identity()) == G.identity()
+
+
+def test_wrapped_target():
+    G = D(5)
+    r, s = G.generators()
+    f = Homomorphism(F, G, [r, s])
+    a, b = F.generators()
+    assert f(a**2 * b) == r**2 * s
+    assert f.evaluate_many([a, a * b, a * b * a]) == [r, r * s, r * s * r]
+
+
+def test_evaluate_many():
+    G = Units(101)
+    f = Homomorphism(F, G, {"a": 2, "b": 3})
+    rng = random.Random(2)
+    words = random_words(rng, 200, 5)
+    words += [w * FreeGroupElement([("a", 1)]) for w in words]
+    assert f.evaluate_many(words) == [f(w) for w in words]
+    assert f.evaluate_many([]) == []
+
+
+def test_trie_limit(monkeypatch):
+    monkeypatch.setattr(homomorphism, "TRIE_LIMIT", 3)
+    G = Units(101)
+    f = Homomorphism(F, G, {"a": 2, "b": 3})
+    words = random_words(random.Random(4), 100, 6)
+    assert f.evaluate_many(words) == [f(w) for w in words]
+
+
+def test_image_limit(monkeypatch):
+    monkeypatch.setattr(homomorphism, "IMAGE_LIMIT", 4)
+    G = Units(101)
+    f = Homomorphism(F, G, {"a": 2, "b": 3})
+    for k in range(100):
+        assert f.image("a", k) == pow(2, k, 101)
+    assert f._powers.stats()["size"] == 4
+
+
+def test_evaluate_many_uneven_lengths():
+    T = CayleyTable(DihedralGroup(5))
+    f = Homomorphism(F, T, [T.encode((True, 1)), T.encode((False, 0))])
+    a, b = F.generators()
+    words = [a**k for k in range(1, 50)] + [(a * b) ** 100, F.identity(), b]
+    assert f.evaluate_many(words).tolist() == [f(w) for w in words]
+
+
+def test_evaluate_many_wrapped_table():
+    T = CayleyTable(DihedralGroup(9))
+    G = Multiplicative(T)
+    x, y = G.generators()
+    f = Homomorphism(F, G, [x, y])
+    words = random_words(random.Random(5), 100, 8)
+    assert f.evaluate_many(words) == [f(w) for w in words]
+    assert f.evaluate_many([]) == []
+
+
+def test_evaluate_many_table():
+    G = DihedralGroup(9)
+    T = CayleyTable(G)
+    images = [T.encode((True, 2)), T.encode((False, 4))]
+    f = Homomorphism(F, T, images)
+    g = Homomorphism(F, G, [(True, 2), (False, 4)])
+    rng = random.Random(3)
+    words = random_words(rng, 300, 8)
+    result = f.evaluate_many(words)
+    assert isinstance(result, np.ndarray)
+    assert [T.decode(x) for x in result] == g.evaluate_many(words)
+    assert [T.decode(f(w)) for w in words] == g.evaluate_many(words)
+    assert f.evaluate_many([]).shape == (0,)
+
+
+def test_packed_words():
+    P = PackedFreeGroup("ab")
+    x, y = P.generators()
+    f = Homomorphism(P, Units(11), [2, 5])
+    assert f(x * y**-1 * x) == 2 * pow(5, -1, 11) * 2 % 11
@@ -0,0 +1,103 @@
+import copy
+import itertools
+import operator
+import pickle
+
+from algebra.dihedral_group import DihedralGroup
+from algebra.free_group import FreeGroup
+from algebra.memo import Memoized, memoize
+from algebra.overload import Multiplicative
+
+
+def test_lru():
+    calls = []
+
+    def f(a, b):
+        calls.append((a, b))
+        return a - b
+
+    g = Memoized(f, maxsize=2)
+    assert g(1, 2) == -1
+    assert g(1, 2) == -1
+    assert g(2, 1) == 1
+    assert g(1, 2) == -1
+    assert g(3, 3) == 0  # evicts (2, 1)
+    assert g(1, 2) == -1
+    assert g(2, 1) == 1  # evicts (3, 3)
+    assert calls == [(1, 2), (2, 1), (3, 3), (2, 1)]
+    assert g.stats() == {"hits": 3, "misses": 4, "evictions": 2, "size": 2}
+    g.clear()
+    assert g(1, 2) == -1
+    assert g.stats()["misses"] == 5
+
+
+def test_promotion():
+    elements = range(5)
+    g = Memoized(lambda a, b: (a * b) % 5, elements=elements)
+    for a, b in itertools.product(elements, repeat=2):
+        assert not g.promoted()
+        assert g(a, b) == a * b % 5
+    assert g.promoted()
+    assert g.stats() == {"hits": 0, "misses": 25, "evictions": 0, "size": 25}
+    assert g(3, 4) == 2
+    assert g.stats()["hits"] == 1
+    h = Memoized(lambda a: -a % 5, elements=elements, arity=1)
+    assert h(2) == 3
+    h.promote()
+    assert [h(a) for a in elements] == [0, 4, 3, 2, 1]
+    assert h.stats()["misses"] == 5
+
+
+def test_arguments_outside_elements():
+    g = Memoized(operator.add, elements=[0, 1])
+    for args in [(0, 0), (0, 1), (5, 5), (1, 0)]:
+        g(*args)
+    assert not g.promoted()
+    assert g(1, 1) == 2
+    assert g.promoted()
+    assert g(5, 5) == 10
+    assert g(0, 7) == 7
+    assert g(1, 0) == 1
+
+
+def test_memoize_option():
+    f = abs
+    assert memoize(f, False) is f
+    assert memoize(f, None) is f
+    assert memoize(f, True).maxsize is None
+    assert memoize(f, 10).maxsize == 10
+
+
+def test_group_wrapper():
+    G = Multiplicative(DihedralGroup(6), memoize=True)
+    H = Multiplicative(DihedralGroup(6))
+    for (a, b), (x, y) in zip(itertools.product(G, repeat=2), itertools.product(H, repeat=2)):
+        assert (a * b).value == (x * y).value
+        assert (a / b).value == (x / y).value
+    stats = G.G.stats()
+    assert stats["op"]["misses"] == 144
+    assert stats["op"]["hits"] == 144
+    assert stats["inv"]["misses"] == 12
+    assert G.G.op.promoted()
+    assert G.G.inv.promoted()
+    assert stats["op"]["size"] == 144
+    assert repr(G) == "Multiplicative(D₆)"
+    assert G.order() == 12
+    bounded = Multiplicative(DihedralGroup(6), memoize=8)
+    for a, b in itertools.product(bounded, repeat=2):
+        a * b
+    assert bounded.G.op.stats()["size"] == 8
+    assert not bounded.G.op.promoted()
+    free = Multiplicative(FreeGroup("ab"), memoize=True)
+    assert free.G.op.elements is None
+
+
+def test_pickle():
+    G = Multiplicative(DihedralGroup(3), memoize=True)
+    elements = list(G)
+    values = [a.value for a in elements]
+    H = pickle.loads(pickle.dumps(G))
+    assert [a.value for a in H] == values
+    assert [(a * b).value for a in H for b in H] == [(a * b).value for a in G for b in G]
+    assert [a.value for a in pickle.loads(pickle.dumps(elements))] == values
+    assert list(copy.deepcopy(G.G)) == values
@@ -1,6 +1,7 @@
 import itertools
 import math
 
+import numpy as np
 import pytest
 
 from algebra import modular
@@ -30,3 +31,67 @@ def test_crt(m, n):
             assert 0 <= c < lcm
             assert (c % m) == (a % m)
             assert (c % n) == (b % n)
+
+
+def test_bezout_many():
+    a, b = np.meshgrid(np.arange(-10, 10), np.arange(-10, 10), indexing="ij")
+    x, y, gcd = modular.bezout_many(a, b)
+    for k in range(a.size):
+        expected = modular.bezout(int(a.flat[k]), int(b.flat[k]))
+        assert (x.flat[k], y.flat[k], gcd.flat[k]) == expected
+    a, b = 2**40 + 15, [2**35 - 1, 7, 0]
+    x, y, gcd = modular.bezout_many(a, b)
+    for k in range(3):
+        assert (x[k], y[k], gcd[k]) == modular.bezout(a, b[k])
+
+
+def test_crt_many():
+    m, n = np.meshgrid(np.arange(1, 11), np.arange(1, 11), indexing="ij")
+    m, n = m.ravel(), n.ravel()
+    gcd = np.gcd(m, n)
+    for a in range(10):
+        for b in range(10):
+            ok = a % gcd == b % gcd
+            c, lcm = modular.crt_many(a, m[ok], b, n[ok])
+            for k, (mk, nk) in enumerate(zip(m[ok].tolist(), n[ok].tolist())):
+                assert (c[k], lcm[k]) == modular.crt(a, mk, b, nk)
+    with pytest.raises(ValueError, match=r"^No solution, because 1 ≢ 0 \(mod 2\)$"):
+        modular.crt_many([1, 1], [3, 4], [0, 0], [5, 6])
+
+
+def test_crt_combine():
+    assert modular.crt_combine([], []) == (0, 1)
+    assert modular.crt_combine([3], [7]) == (3, 7)
+    primes = [p for p in range(2, 600) if all(p % q for q in range(2, p))]
+    x = 12345678901234567890123456789 ** 3
+    c, m = modular.crt_combine([x % p for p in primes], primes)
+    assert m == math.prod(primes)
+    assert c == x % m
+    moduli = list(range(1, 40))
+    c, m = modular.crt_combine([x % k for k in moduli], moduli)
+    assert m == math.lcm(*moduli)
+    assert c == x % m
+    with pytest.raises(ValueError):
+        modular.crt_combine([0, 1, 0], [3, 4, 6])
+
+
+def test_inverse():
+    for n in range(1, 30):
+        units = [a for a in range(-n, n) if math.gcd(a, n) == 1]
+        for a in units:
+            assert a * modular.inverse(a, n) % n == 1 % n
+        assert modular.inverse_many(units, n) == [modular.inverse(a, n) for a in units]
+    assert modular.inverse_many([], 7) == []
+    with pytest.raises(ValueError, match=r"^0 is not invertible modulo 5$"):
+        modular.inverse(0, 5)
+    with pytest.raises(ValueError, match=r"^2 is not invertible modulo 4$"):
+        modular.inverse_many([1, 3, 2, 3], 4)
+
+
+def test_factorize():
+    for n in range(1, 500):
+        factors = modular.factorize(n)
+        assert math.prod(p**e for p, e in factors) == n
+        assert all(modular.factorize(p) == [(p, 1)] for p, _ in factors)
+        assert [p for p, _ in factors] == sorted(set(p for p, _ in factors))
+    assert modular.factorize(2**20 * 1000003) == [(2, 20), (1000003, 1)]
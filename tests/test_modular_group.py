@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pytest
+
+from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.modular_group import U, Units, Z, Zmod
+from algebra.overload import FLYWEIGHT_LIMIT, Multiplicative
+from algebra.product import DirectProduct
+
+CYCLIC_GROUPS = [Z(n) for n in range(1, 21)]
+UNIT_GROUPS = [U(n) for n in range(1, 31)] + [U(n, table=False) for n in (1, 12, 29, 30)]
+
+
+@pytest.mark.parametrize("G", CYCLIC_GROUPS)
+def test_cyclic(G):
+    n = G.modulus()
+    assertion.is_associative(G.op, G)
+    assertion.is_commutative(G.op, G)
+    assertion.is_identity(G.zero(), G.op, G)
+    gens = list(G.generators())
+    assert assertion.generating_set(G.op, G, gens) == gens
+    e = G.zero()
+    for a in G:
+        assert a + -a == e
+        for k in range(-n, 2 * n):
+            assert (a @ k).value == a.value * k % n
+
+
+@pytest.mark.parametrize("G", UNIT_GROUPS)
+def test_units(G):
+    n = G.modulus()
+    elements = list(G)
+    assert [a.value for a in elements] == [a for a in range(n) if math.gcd(a, n) == 1]
+    assert G.order() == len(elements)
+    assertion.is_associative(G.op, G)
+    assertion.is_commutative(G.op, G)
+    assertion.is_identity(G.one(), G.op, G)
+    e = G.one()
+    for a in G:
+        assert a * a.inv() == e
+        ak = e
+        for k in range(2 * n):
+            assert a**k == ak
+            assert a**-k * ak == e
+            ak = ak * a
+
+
+@pytest.mark.parametrize("G", [Z(12), U(12), U(35), U(97, table=False)])
+def test_element_order(G):
+    e = G.identity()
+    for a in G:
+        k = a.order()
+        assert G.order() % k == 0
+        assert a.rep(k) == e
+        assert all(a.rep(j) != e for j in range(1, k))
+
+
+@pytest.mark.parametrize("n", [1, 2, 8, 15, 20, 63, 97])
+def test_generators(n):
+    T = CayleyTable(U(n))
+    generators = list(T.G.G.generators())
+    assert generators == sorted(generators)
+    assert T.subgroup(T.generators()) == (1 << len(T)) - 1
+    assert T.center() == (1 << len(T)) - 1
+    assert T.normal_closure([T.identity()]) == 1 << T.identity()
+    assert T.class_equation() == (len(T), [])
+
+
+def test_generators_of_products():
+    G = DirectProduct(Zmod(6), Units(20))
+    assert list(G.generators()) == [(1, 1), (0, 3), (0, 11)]
+
+
+def test_flyweight():
+    assert U(FLYWEIGHT_LIMIT)._elements is not None
+    assert U(FLYWEIGHT_LIMIT + 1)._elements is None
+    # Wrapping does not factor the modulus to find the order.
+    for memoize in (False, True):
+        G = Multiplicative(Units(2**127 - 1, table=False), memoize=memoize)
+        assert G._elements is None
+        assert G.G._order is None
+
+
+def test_order():
+    assert Units(2**10 * 3**5 * 7 * 101, table=False).order() == 2**9 * 2 * 3**4 * 6 * 100
+    assert Units(1000003, table=False).order() == 1000002
+
+
+def test_large_modulus():
+    p = 2**127 - 1
+    G = U(p)
+    a = G.G.decode(3)
+    assert G.G.inv(a) == pow(3, -1, p)
+    assert G.G.rep(a, p - 1) == 1
+    codes = np.array([2, 3, 5, 2**100], dtype=object)
+    assert G.inv_many(codes).tolist() == [pow(c, -1, p) for c in codes]
+    assert G.rep_many(codes, -(2**70)).tolist() == [pow(c, -(2**70), p) for c in codes]
+    assert Z(p).rep_many(codes, p + 2).tolist() == [2 * c % p for c in codes]
+
+
+@pytest.mark.parametrize("G", [Z(12), U(12), U(12, table=False), U(35)])
+def test_batch(G):
+    elements = list(G)
+    codes = G.encode_many(elements)
+    assert G.decode_many(codes) == elements
+    a, b = np.meshgrid(codes, codes, indexing="ij")
+    products = G.op_many(a.ravel(), b.ravel())
+    assert G.decode_many(products) == [x.op(y) for x in elements for y in elements]
+    assert G.decode_many(G.inv_many(codes)) == [x.inv() for x in elements]
+    for k in (-3, 0, 1, 2, 7, 2**100 + 1):
+        assert G.decode_many(G.rep_many(codes, k)) == [x.rep(k) for x in elements]
+    exponents = np.arange(len(codes)) - 5
+    assert G.decode_many(G.rep_many(codes, exponents)) == [
+        x.rep(k) for x, k in zip(elements, exponents.tolist())
+    ]
+
+
+def test_inverse_errors():
+    with pytest.raises(ValueError, match=r"^4 is not invertible modulo 6$"):
+        Units(6, table=False).inv(4)
+    with pytest.raises(ValueError, match=r"^3 is not invertible modulo 6$"):
+        Units(6, table=False).inv_many([1, 5, 3, 2])
+    with pytest.raises(ValueError, match=r"^cannot handle exponent 0.5$"):
+        Zmod(6).rep(1, 0.5)
+
+
+def test_cayley_table():
+    T = CayleyTable(Units(15))
+    assert [T.decode(a) for a in T] == [1, 2, 4, 7, 8, 11, 13, 14]
+    assert T.decode(T.op(T.encode(2), T.encode(7))) == 14
+    assertion.table_is_associative(T.table)
@@ -0,0 +1,103 @@
+import operator
+import pickle
+
+import numpy as np
+import pytest
+
+from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import D, DihedralGroup
+from algebra.overload import Additive, Multiplicative
+from algebra.ward_quasigroup import WardQuasigroup
+
+
+def test_generic_batch_without_encoding():
+    n = 5
+    W = WardQuasigroup(list(range(n)), lambda a, b: (a - b) % n)
+    G = Additive(W.group())
+    elements = list(G)
+    codes = G.encode_many(elements)
+    assert codes.dtype == object
+    assert G.decode_many(codes) == elements
+    assert G.op_many(codes, codes[::-1]).tolist() == [(a + n - 1 - a) % n for a in range(n)]
+    assert G.inv_many(codes).tolist() == [-a % n for a in range(n)]
+    assert G.rep_many(codes, 3).tolist() == [3 * a % n for a in range(n)]
+    assert G.rep_many(codes, [0, 1, 2, 3, 4]).tolist() == [a * a % n for a in range(n)]
+
+
+def test_generic_batch_with_encoding():
+    G = Multiplicative(CayleyTable(DihedralGroup(4)))
+    H = Multiplicative(DihedralGroup(4))
+    a = np.arange(8)
+    products = H.op_many(a[:, None], a[None, :])
+    assert G.op_many(a[:, None], a[None, :]).tolist() == products.tolist()
+    assert G.inv_many(a).tolist() == H.inv_many(a).tolist()
+    assert G.rep_many(a, 3).tolist() == H.rep_many(a, 3).tolist()
+    elements = list(G)
+    assert G.encode_many(elements).tolist() == a.tolist()
+    assert G.decode_many(a) == elements
+    assert [repr(x) for x in G.decode_many(a)] == [repr(x) for x in H.decode_many(a)]
+    products = G.op_many(G.encode_many(elements)[:, None], a[None, :])
+    assert G.decode_many(products.ravel()) == [x * y for x in elements for y in elements]
+
+
+def test_flyweight():
+    G = Multiplicative(DihedralGroup(5))
+    elements = list(G)
+    assert list(G) == elements
+    for a in elements:
+        for b in elements:
+            assert a * b is G.op(a, b)
+            assert (a * b) in elements
+        assert a.inv() is a**-1
+    assert G.one() is G.identity()
+    assert not hasattr(elements[0], "__dict__")
+
+
+def test_flyweight_limit():
+    assert Multiplicative(DihedralGroup(10**6))._elements is None
+    assert Multiplicative(DihedralGroup(100))._elements is not None
+
+
+def test_pickle():
+    G = Multiplicative(DihedralGroup(3))
+    elements = pickle.loads(pickle.dumps(list(G)))
+    assert [a.value for a in elements] == [a.value for a in G]
+    a, b = elements[1], elements[4]
+    assert (a * b).value == G.op(G._wrap(a.value), G._wrap(b.value)).value
+    assert pickle.loads(pickle.dumps(G)).order() == 6
+
+
+def test_parallel_check():
+    assertion.is_associative(operator.mul, list(D(3)), workers=2)
+
+
+def test_no_flyweight():
+    G = Multiplicative(DihedralGroup(5), flyweight=False)
+    a, b = list(G)[1:3]
+    assert a * b is not a * b
+    assert a * b == a * b
+    assert hash(a * b) == hash(a * b)
+
+
+def test_trusted():
+    checked = Multiplicative(DihedralGroup(3))
+    trusted = Multiplicative(DihedralGroup(3), trusted=True)
+    a = next(iter(checked))
+    b = next(iter(trusted))
+    with pytest.raises(AssertionError):
+        checked.op(a, b)
+    with pytest.raises(AssertionError):
+        checked.op(a, b.value)
+    trusted.op(b, b)
+    products = [(x * y).value for x in checked for y in checked]
+    assert [(x * y).value for x in trusted for y in trusted] == products
+
+
+def test_additive():
+    G = Additive(CayleyTable(DihedralGroup(4)))
+    for a in G:
+        assert G.op(a, G.inv(a)) == G.zero()
+        assert G.rep(a, 4) == G.zero()
+        assert a - a == G.zero()
+        assert a @ 3 == a + a + a
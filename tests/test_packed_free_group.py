@@ -0,0 +1,82 @@
+from functools import reduce
+from itertools import permutations, product
+
+import pytest
+
+from algebra import assertion
+from algebra.free_group import FreeGroup
+from algebra.packed_free_group import PackedFreeGroup
+
+PACKED_FREE_GROUPS = [
+    PackedFreeGroup(["a"]),
+    PackedFreeGroup(["a", "b"]),
+    PackedFreeGroup(["a", "b", "c"]),
+]
+
+
+def gen_elements(G):
+    elems = list(G.generators())
+    for a in G.generators():
+        elems.append(a.inv())
+    for n in range(3):
+        for p in permutations(elems, n):
+            yield reduce(G.op, p, G.identity())
+
+
+@pytest.mark.parametrize("G", PACKED_FREE_GROUPS)
+def test_associativity(G):
+    assertion.is_associative(G.op, gen_elements(G))
+
+
+@pytest.mark.parametrize("G", PACKED_FREE_GROUPS)
+def test_inverse(G):
+    e = G.identity()
+    for a in gen_elements(G):
+        b = a.inv()
+        assert a * b == e
+        assert b * a == e
+        assert e * a == a
+        assert a * e == a
+
+
+@pytest.mark.parametrize("G", PACKED_FREE_GROUPS)
+def test_power(G):
+    e = G.one()
+    for a in gen_elements(G):
+        ak = e
+        for k in range(10):
+            assert ak == a**k
+            assert ak * a**-k == e
+            ak = ak * a
+
+
+@pytest.mark.parametrize("G", PACKED_FREE_GROUPS)
+def test_agrees_with_free_group(G):
+    F = FreeGroup(G._generators)
+    for a, b in product(gen_elements(G), repeat=2):
+        assert (a * b).unpack() == a.unpack() * b.unpack()
+        assert repr(a * b) == repr(a.unpack() * b.unpack())
+        assert G.pack(a.unpack()) == a
+        assert hash(G.pack(a.unpack())) == hash(a)
+    assert [G.pack(a) for a in F.generators()] == list(G.generators())
+
+
+def test_sharing():
+    G = PackedFreeGroup(["a", "b"])
+    a, b = G.generators()
+    w = G.identity()
+    words = []
+    for _ in range(100):
+        w = w * a * b
+        words.append(w)
+    # Every word is a prefix view of the same arrays.
+    assert len({id(w._gens) for w in words}) == 1
+    for k, w in enumerate(words, 1):
+        assert repr(w) == " ".join(["a b"] * k)
+    # Cancellation yields views into the operands.
+    assert (words[-1] * b.inv())._gens is words[-1]._gens
+    assert (a.inv() * words[-1])._gens is words[-1]._gens
+    assert a.inv() * words[-1] == b * words[-2]
+    assert words[1] * (a * b).inv() == words[0]
+    assert words[2] * words[2].inv() == G.identity()
+    assert repr(words[1] * a**2) == "a b a b a²"
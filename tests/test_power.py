@@ -0,0 +1,95 @@
+import pytest
+
+from algebra import power
+from algebra.dihedral_group import DihedralGroup
+from algebra.free_group import FreeGroup
+from algebra.modular_group import Z, Units
+from algebra.overload import Multiplicative
+
+
+class Counting:
+    """Wraps a group and counts calls of op."""
+
+    def __init__(self, G):
+        self.G = G
+        self.ops = 0
+
+    def identity(self):
+        return self.G.identity()
+
+    def inv(self, a):
+        return self.G.inv(a)
+
+    def op(self, a, b):
+        self.ops += 1
+        return self.G.op(a, b)
+
+
+EXPONENTS = [0, 1, 2, 3, 5, 8, 31, 32, 33, 255, 1000, 2**40 + 12345, 3**100, 2**200 - 1]
+
+
+@pytest.mark.parametrize("width", [None, 1, 2, 3, 5])
+def test_window_integer_power(width):
+    G = FreeGroup("ab")
+    a, b = G.generators()
+    w = a * b**2
+    for n in EXPONENTS[:9]:
+        for k in (n, -n):
+            assert power.window_integer_power(G, w, k, width) == w**k
+    U = Units(2**127 - 1, table=False)
+    for n in EXPONENTS:
+        for k in (n, -n):
+            assert power.window_integer_power(U, 3, k, width) == U.rep(3, k)
+
+
+def test_group_integer_power():
+    U = Units(2**127 - 1, table=False)
+    for n in EXPONENTS:
+        for k in (n, -n):
+            assert power.group_integer_power(U, 3, k) == U.rep(3, k)
+    with pytest.raises(ValueError, match=r"^cannot handle exponent 0.5$"):
+        power.group_integer_power(U, 3, 0.5)
+
+
+def test_wrapped_groups():
+    G = Multiplicative(FreeGroup(["a"]))
+    (a,) = G.generators()
+    assert not hasattr(G, "element_order")
+    assert power.group_integer_power(G, a, 3) == a * a * a
+    assert power.group_integer_power(G, a, -(2**40)).value == (a.value ** -(2**40))
+    Z12 = Z(12)
+    elements = list(Z12)
+    assert Z12.element_order(elements[8]) == 3
+    assert power.group_integer_power(Z12, elements[1], 2**100 + 5) == elements[9]
+
+
+def test_fewer_operations():
+    G = Units(2**521 - 1, table=False)
+    n = 3**300
+    binary = Counting(G)
+    window = Counting(G)
+    assert power.window_integer_power(window, 3, n) == pow(3, n, 2**521 - 1)
+    a = binary.identity()
+    b = 3
+    while n > 0:
+        if n & 1:
+            a = binary.op(a, b)
+        b = binary.op(b, b)
+        n >>= 1
+    assert window.ops < 0.8 * binary.ops
+
+
+def test_multi_integer_power():
+    p = 2**127 - 1
+    U = Units(p, table=False)
+    bases = [2, 3, 5, 7]
+    for exponents in ([0, 0, 0, 0], [1, -1, 2, 0], [2**100, 3**50, -(5**40), 12345]):
+        expected = 1
+        for b, e in zip(bases, exponents):
+            expected = expected * pow(b, e, p) % p
+        for width in (None, 1, 2, 4):
+            assert power.multi_integer_power(U, bases, exponents, width) == expected
+    assert power.multi_integer_power(U, [], []) == 1
+    D = DihedralGroup(12)
+    r = True, 5
+    assert power.multi_integer_power(D, [r, (True, 1)], [7, -3]) == (True, 32 % 12)
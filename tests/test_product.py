@@ -0,0 +1,129 @@
+import copy
+import itertools
+import pickle
+
+import numpy as np
+import pytest
+
+from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import DihedralGroup
+from algebra.modular_group import Units, Zmod
+from algebra.overload import Multiplicative
+from algebra.power import element_order
+from algebra.product import DirectProduct, SemidirectProduct
+
+
+def negate(h, n, m):
+    return n if h == 0 else -n % m
+
+
+def negate6(h, n):
+    return negate(h, n, 6)
+
+
+PRODUCTS = [
+    DirectProduct(DihedralGroup(3), Zmod(4)),
+    DirectProduct(Zmod(2), Zmod(6), DihedralGroup(2)),
+    DirectProduct(CayleyTable(DihedralGroup(3)), CayleyTable(Zmod(4))),
+    DirectProduct(CayleyTable(Zmod(2)), CayleyTable(Units(9)), CayleyTable(Zmod(3))),
+    SemidirectProduct(Zmod(5), Zmod(2), lambda h, n: negate(h, n, 5)),
+    SemidirectProduct(CayleyTable(Zmod(6)), CayleyTable(Zmod(2)), negate6),
+]
+
+
+@pytest.mark.parametrize("G", PRODUCTS)
+def test_group(G):
+    elements = list(G)
+    assert len(elements) == len(set(elements)) == G.order()
+    assertion.is_associative(G.op, elements)
+    assertion.is_identity(G.identity(), G.op, elements)
+    for a in elements:
+        assert G.op(a, G.inv(a)) == G.identity()
+        for k in (-3, 0, 1, 2, 5):
+            expected = G.identity()
+            for _ in range(abs(k)):
+                expected = G.op(expected, a if k > 0 else G.inv(a))
+            assert G.rep(a, k) == expected
+    gens = list(G.generators())
+    assert assertion.generating_set(G.op, elements, gens)
+
+
+@pytest.mark.parametrize("G", PRODUCTS[:4])
+def test_element_order(G):
+    for a in G:
+        k = G.element_order(a)
+        assert G.rep(a, k) == G.identity()
+        assert all(G.rep(a, j) != G.identity() for j in range(1, k))
+
+
+def test_semidirect_is_dihedral():
+    G = SemidirectProduct(Zmod(5), Zmod(2), lambda h, n: negate(h, n, 5))
+    D = DihedralGroup(5)
+    # (n, 0) ↦ rₙ and (n, 1) ↦ sₙ.
+    iso = {(n, h): (h == 0, n) for n, h in G}
+    for a, b in itertools.product(G, repeat=2):
+        assert iso[G.op(a, b)] == D.op(iso[a], iso[b])
+
+
+@pytest.mark.parametrize("G", [PRODUCTS[2], PRODUCTS[3], PRODUCTS[5]])
+def test_batch(G):
+    elements = list(G)
+    codes = np.array([G.encode(a) for a in elements])
+    assert codes.tolist() == list(range(G.order()))
+    assert [G.decode(c) for c in codes] == elements
+    a, b = np.meshgrid(codes, codes, indexing="ij")
+    products = G.op_many(a, b)
+    assert [G.decode(c) for c in products.ravel()] == [
+        G.op(x, y) for x in elements for y in elements
+    ]
+    assert [G.decode(c) for c in G.inv_many(codes)] == [G.inv(x) for x in elements]
+    T = CayleyTable(G)
+    assertion.table_is_associative(T.table)
+
+
+@pytest.mark.parametrize(
+    "G",
+    [
+        PRODUCTS[0],
+        PRODUCTS[3],
+        SemidirectProduct(Zmod(6), Zmod(2), negate6),
+        SemidirectProduct(CayleyTable(Zmod(6)), CayleyTable(Zmod(2)), negate6),
+    ],
+)
+def test_pickle_and_copy(G):
+    for H in (pickle.loads(pickle.dumps(G)), copy.copy(G), copy.deepcopy(G)):
+        assert type(H) is type(G)
+        assert list(H) == list(G)
+        assert [H.op(a, b) for a in H for b in H] == [G.op(a, b) for a in G for b in G]
+        if hasattr(G, "encode"):
+            assert [H.encode(a) for a in H] == [G.encode(a) for a in G]
+
+
+def test_rep_many():
+    G = PRODUCTS[3]
+    codes = np.arange(G.order())
+    for k in (-2, 0, 3, 2**70):
+        assert [G.decode(c) for c in G.rep_many(codes, k)] == [G.rep(a, k) for a in G]
+
+
+def test_large_factors():
+    A = CayleyTable(Zmod(400))
+    B = CayleyTable(DihedralGroup(200))
+    G = DirectProduct(A, B)
+    rng = np.random.default_rng(1)
+    a = rng.integers(G.order(), size=1000)
+    b = rng.integers(G.order(), size=1000)
+    products = G.op_many(a, b)
+    for x, y, z in zip(a[:50], b[:50], products[:50]):
+        assert G.decode(z) == G.op(G.decode(x), G.decode(y))
+
+
+def test_wrapped():
+    G = Multiplicative(DirectProduct(DihedralGroup(4), Zmod(3)))
+    e = G.one()
+    for a in G:
+        assert a * a.inv() == e
+        assert a ** a.order() == e
+    assert repr(G.identity()) == "(r₀, 0)"
+    assert element_order(G.G, ((True, 1), 1)) == 12
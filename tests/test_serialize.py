@@ -0,0 +1,82 @@
+import io
+
+import numpy as np
+import pytest
+
+from algebra import serialize
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import DihedralGroup
+from algebra.free_group import FreeGroup, FreeGroupElement
+from algebra.packed_free_group import PackedFreeGroup
+
+WORDS = [
+    [],
+    [("a", 1)],
+    [("a", -1), ("b", 300), ("c", -(2**40))],
+    [("c", 2), ("a", 1), ("c", -64), ("b", 63)],
+]
+
+
+@pytest.mark.parametrize("n", [0, 1, 127, 128, 300, 2**63, 2**200])
+def test_varint(n):
+    out = bytearray(b"x")
+    serialize.write_varint(out, n)
+    assert serialize.read_varint(out, 1) == (n, len(out))
+
+
+def test_words():
+    G = FreeGroup("abc")
+    words = [FreeGroupElement(w) for w in WORDS]
+    for w in words:
+        assert serialize.loads_word(G, serialize.dumps_word(G, w)) == w
+    assert serialize.dumps_word(G, words[1]) == bytes([1, 0, 2])
+    f = io.BytesIO()
+    serialize.write_words(f, G, words * 3, batch_size=2)
+    assert list(serialize.read_words(G, f.getbuffer())) == words * 3
+
+
+def test_huge_exponents():
+    G = FreeGroup("ab")
+    w = FreeGroupElement([("a", 2**70), ("b", -(2**64) - 1)])
+    assert serialize.loads_word(G, serialize.dumps_word(G, w)) == w
+
+
+def test_packed_words():
+    G = PackedFreeGroup("abc")
+    words = [G.pack(FreeGroupElement(w)) for w in WORDS]
+    f = io.BytesIO()
+    serialize.write_words(f, G, words)
+    data = f.getvalue()
+    assert list(serialize.read_words(G, data)) == words
+    assert list(serialize.read_words(FreeGroup("abc"), data)) == [w.unpack() for w in words]
+
+
+def test_elements(tmp_path):
+    G = DihedralGroup(7)
+    elements = list(G)[::-1]
+    path = tmp_path / "elements.bin"
+    with open(path, "wb") as f:
+        serialize.write_elements(f, G, elements)
+        serialize.write_elements(f, G, [])
+    buffer = serialize.map_file(path)
+    read, pos = serialize.read_elements(G, buffer)
+    assert read == elements
+    assert serialize.read_elements(G, buffer, pos) == ([], len(buffer))
+    codes, pos = serialize.loads_codes(buffer)
+    assert codes.dtype == np.dtype("<u1")
+    assert not codes.flags.writeable
+    empty, end = serialize.loads_codes(buffer, pos)
+    assert empty.shape == (0,)
+    assert end == len(buffer)
+    del codes, empty
+
+
+@pytest.mark.parametrize("n", [1, 5, 200])
+def test_table(n):
+    T = CayleyTable(DihedralGroup(n))
+    data = serialize.dumps_codes(T.table)
+    table, end = serialize.loads_codes(data)
+    assert end == len(data)
+    assert table.itemsize == (1 if 2 * n <= 256 else 2)
+    assert np.array_equal(table, T.table)
+    assert np.shares_memory(table, np.frombuffer(data, dtype=np.uint8))
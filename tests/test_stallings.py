@@ -0,0 +1,132 @@
+import random
+
+from algebra.free_group import FreeGroup, FreeGroupElement
+from algebra.packed_free_group import PackedFreeGroup
+
+F = FreeGroup("ab")
+a, b = F.generators()
+e = F.identity()
+
+
+def random_word(rng, length, generators="ab"):
+    word = e
+    for _ in range(length):
+        word = word * FreeGroupElement([(rng.choice(generators), rng.choice([-2, -1, 1, 3]))])
+    return word
+
+
+def random_element(rng, words, length):
+    h = e
+    for _ in range(length):
+        h = h * rng.choice(words) ** rng.choice([-1, 1])
+    return h
+
+
+def exponent_sum(word, g):
+    return sum(k for x, k in word.value if x == g)
+
+
+def test_even_subgroup():
+    H = F.subgroup([a**2, b, a * b * a.inv()])
+    assert H.index() == 2
+    assert H.rank() == 3
+    assert H.vertices() == 2
+    rng = random.Random(1)
+    for _ in range(200):
+        w = random_word(rng, rng.randrange(8))
+        assert (w in H) == (exponent_sum(w, "a") % 2 == 0)
+        rep = H.coset_representative(w)
+        assert rep == (e if exponent_sum(w, "a") % 2 == 0 else a)
+
+
+def test_infinite_index():
+    H = F.subgroup([a**2, b**3, a * b * a * b.inv()])
+    assert H.index() == float("inf")
+    rng = random.Random(2)
+    words = [a**2, b**3, a * b * a * b.inv()]
+    for _ in range(100):
+        h = random_element(rng, words, 5)
+        assert h in H
+        w = random_word(rng, 6)
+        assert H.coset_representative(h * w) == H.coset_representative(w)
+        assert (w in H) == (H.coset_representative(w) == e)
+    assert a not in H
+    assert b not in H
+    assert a * b not in H
+
+
+def test_huge_exponents():
+    n = 10**20
+    H = F.subgroup([a**2, b**3, a * b * a * b.inv()])
+    assert a**n in H
+    assert a ** (n + 1) not in H
+    assert H.coset_representative(a ** (n + 1)) == a
+    assert b ** (-3 * n) * a ** (2 * n) in H
+    assert H.coset_representative(b**n) == b
+    K = F.subgroup([a**3 * b])
+    assert a**n not in K
+    assert K.coset_representative(a**n * b) == b.inv() * a ** (n - 3) * b
+    assert K.coset_representative(b * a**n) == b * a**n
+
+
+def test_basis():
+    rng = random.Random(3)
+    for _ in range(20):
+        words = [random_word(rng, rng.randrange(1, 5)) for _ in range(rng.randrange(1, 4))]
+        H = F.subgroup(words)
+        basis = H.basis()
+        assert len(basis) == H.rank() <= len(words)
+        assert all(w in H for w in basis)
+        K = F.subgroup(basis)
+        assert K.vertices() == H.vertices()
+        assert all(w in K for w in words)
+
+
+def test_trivial_and_whole():
+    H = F.subgroup([])
+    assert H.rank() == 0
+    assert H.index() == float("inf")
+    assert e in H
+    assert a not in H
+    assert H.coset_representative(a * b) == a * b
+    H = F.subgroup([a, b, e])
+    assert H.index() == 1
+    assert H.rank() == 2
+    assert a**-5 * b in H
+
+
+def test_folding_cascade():
+    # Conjugates that fold into a single loop.
+    H = F.subgroup([b * a**3 * b.inv(), b * a**2 * b.inv()])
+    assert H.rank() == 1
+    assert b * a * b.inv() in H
+    assert a not in H
+
+
+def test_packed():
+    G = PackedFreeGroup("ab")
+    x, y = G.generators()
+    H = G.subgroup([x * x, y, x * y * x.inv()])
+    assert H.index() == 2
+    assert x * y * x in H
+    assert x * y not in H
+
+
+def test_many_generators():
+    G = FreeGroup("xyz")
+    x, y, z = G.generators()
+    count = 10**4
+    # Conjugates of z by distinct words u of length 14 in x and y.
+    prefixes = []
+    for k in range(count):
+        u = G.identity()
+        for bit in range(14):
+            u = u * (y if k >> bit & 1 else x)
+        prefixes.append(u)
+    H = G.subgroup([u * z * u.inv() for u in prefixes])
+    assert H.rank() == count
+    assert H.index() == float("inf")
+    u = prefixes[count // 2]
+    assert u * z**5 * u.inv() in H
+    assert u * z * u.inv() * prefixes[7] * z**-1 * prefixes[7].inv() in H
+    assert u * z not in H
@@ -1,8 +1,11 @@
 import itertools
 
+import numpy as np
 import pytest
 
 from algebra import assertion
+from algebra.cayley import CayleyTable
+from algebra.dihedral_group import D, DihedralGroup
 from algebra.ward_quasigroup import WardQuasigroup
 
 
@@ -85,6 +88,11 @@ def D6():
 
 
 WARD_QUASIGROUPS = [W1(), W2(), W3(), V(), D6()]
+WARD_QUASIGROUPS += [S().precompute() for S in (W1, W2, W3, V, D6)]
+WARD_QUASIGROUPS += [WardQuasigroup.from_table([[1, 0, 2], [2, 1, 0], [0, 2, 1]])]
+WARD_QUASIGROUPS += [WardQuasigroup.from_group(G) for G in (D(3), DihedralGroup(4))]
+WARD_QUASIGROUPS += [WardQuasigroup(S().S, S()._div, memoize=True) for S in (W3, D6)]
+WARD_QUASIGROUPS += [WardQuasigroup(D6().S, D6()._div, memoize=5)]
 
 
 # The tests here closely follow the structure of Ward's original paper:
@@ -289,3 +297,117 @@ def test_inverses(S):
         y = G(z, x)
         assert x == H(y, z)
         assert z == x / y
+
+
+@pytest.mark.parametrize("S", [W1(), W2(), W3(), V(), D6()])
+def test_precompute(S):
+    elements = list(S)
+    T = WardQuasigroup(S.S, S._div).precompute()
+    assert T.precompute() is T
+    assert list(T) == elements
+    assert all(a is b for a, b in zip(T, T))
+    i = T.right_identity()
+    assert i is T.right_identity()
+    assert i == S.right_identity()
+    for a, b in itertools.product(T, repeat=2):
+        assert a / b is T.inverse(b) * a
+        assert (a / b).value == S._div(a.value, b.value)
+        assert (a * b).value == H(a, b).value
+        assert (a ^ b).value == G(a, b).value
+        assert a * b in T
+    # Elements of a precomputed quasigroup mix with others.
+    for a, b in itertools.product(S, T):
+        assert (a / b).value == S._div(a.value, b.value)
+        assert (b / a).value == S._div(b.value, a.value)
+        assert (a * b).value == H(a, b).value
+
+
+def test_from_table():
+    S = W3()
+    T = WardQuasigroup.from_table([[1, 0, 2], [2, 1, 0], [0, 2, 1]])
+    assert [a.value for a in T] == [0, 1, 2]
+    assert T.right_identity().value == 1
+    for a, b in itertools.product(T, repeat=2):
+        assert (a / b).value == S._div(a.value, b.value)
+        assert a / b is T.inverse(b) * a
+    L = WardQuasigroup.from_table(np.array([[0, 1], [1, 0]]), S=["e", "x"])
+    e, x = L
+    assert x / x is e
+    assert (x * e).value == "x"
+
+
+@pytest.mark.parametrize(
+    "table,message",
+    [
+        ([], r"^division table must be square and non-empty, not of shape \(0,\)$"),
+        ([[0, 1]], r"^division table must be square"),
+        ([[0.0]], r"^division table must have integer entries, not float64$"),
+        ([[0, 2], [1, 0]], r"^0 / 1 == 2 is not an element$"),
+        ([[0, 0], [1, 1]], r"^0 / 0 == 0 / 1 == 0 but 0 != 1$"),
+        ([[0, 1], [0, 1]], r"^0 / 0 == 1 / 0 == 0 but 0 != 1$"),
+        ([[1, 0, 2], [0, 2, 1], [2, 1, 0]], r"^there is no a with a / a == a$"),
+        ([[0, 2, 1], [2, 1, 0], [1, 0, 2]], r"^0 / 0 == 0 and 1 / 1 == 1$"),
+        ([[0, 1, 2], [2, 0, 1], [1, 2, 0]],
+         r"^\(\d / \d\) / \d == \d != \d == \d / \(\d / \(0 / \d\)\)$"),
+    ],
+)
+def test_from_table_failures(table, message):
+    with pytest.raises(ValueError, match=message):
+        WardQuasigroup.from_table(table)
+
+
+def test_from_table_postulate_2():
+    # A Latin square with a unique idempotent, but a / a not constant.
+    table = [[0, 1, 2], [1, 2, 0], [2, 0, 1]]
+    with pytest.raises(ValueError, match=r"^1 / 1 == 2 != 0 == 0 / 0$"):
+        WardQuasigroup.from_table(table)
+
+
+@pytest.mark.parametrize("n", [1, 2, 6, 15])
+def test_from_table_dihedral(n):
+    T = CayleyTable(DihedralGroup(n))
+    div = T.table[:, T.inverses]
+    Q = WardQuasigroup.from_table(div, S=[T.decode(a) for a in T])
+    assert Q.right_identity().value == (True, 0)
+    assert assertion.table_is_probably_ward(div, seed=0)
+    # b / a == a / b is not the division table of a non-abelian group.
+    if n > 2:
+        with pytest.raises(ValueError, match=r"^\(.*\) / .* != .* == .*$"):
+            WardQuasigroup.from_table(div.T)
+
+
+@pytest.mark.parametrize(
+    "G", [DihedralGroup(1), DihedralGroup(4), D(5), CayleyTable(DihedralGroup(3))]
+)
+def test_from_group(G):
+    Q = WardQuasigroup.from_group(G)
+    assert len(Q) == G.order()
+    assert Q.right_identity().value == G.identity()
+    for a, b in itertools.product(Q, repeat=2):
+        x, y = a.value, b.value
+        assert (a / b).value == G.op(x, G.inv(y))
+        # The derived group is the opposite group: x ▱ y == y x.
+        assert (a * b).value == G.op(y, x)
+        assert (a ^ b).value == G.op(G.inv(x), y)
+    assert assertion.table_is_probably_ward(Q._tables.div, seed=0)
+    check = WardQuasigroup.from_table(Q._tables.div, [a.value for a in Q])
+    assert [a.value for a in check] == [a.value for a in Q]
+
+
+def test_memoize():
+    calls = []
+
+    def div(a, b):
+        calls.append((a, b))
+        return (a - b) % 4
+
+    W = WardQuasigroup(list(range(4)), div, memoize=True)
+    elements = list(W)
+    for _ in range(3):
+        for a, b in itertools.product(elements, repeat=2):
+            assert (a * b).value == (a.value + b.value) % 4
+    assert len(calls) == len(set(calls)) == 16
+    assert W._div.promoted()
+    stats = W._div.stats()
+    assert stats["misses"] == 16
+    assert stats["evictions"] == 0